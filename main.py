@@ -2,7 +2,6 @@
 
 import os
 import sys
-from src.desktop_mascot import DesktopMascot
 
 # アプリケーションのバージョン情報 ---
 # リリースを更新する際に、このバージョン番号を更新してください。
@@ -16,13 +15,19 @@ if getattr(sys, 'frozen', False):
     APP_ROOT_DIR = os.path.dirname(sys.executable)
 else:
     # スクリプトとして実行されている場合、スクリプトのパスを取得
-    APP_ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+    # (スクリプト実行時の__file__は既に絶対パスなので、abspathによる解決は不要)
+    APP_ROOT_DIR = os.path.dirname(__file__) or os.getcwd()
 
 # --- アプリケーションのエントリーポイント ---
 if __name__ == "__main__":
     # 作業ディレクトリをスクリプトのルートに変更します。
     # これにより、設定ファイル等が相対パスで正しく読み込まれるようになります。
-    os.chdir(APP_ROOT_DIR)
+    # 既にルートで起動されている場合は変更しません。
+    if APP_ROOT_DIR != os.getcwd():
+        os.chdir(APP_ROOT_DIR)
+
+    # tkinterやPILなどを読み込む重いモジュールは、エントリーポイントで初めてインポートします。
+    from src.desktop_mascot import DesktopMascot
     
     # アプリケーションのメインクラスをインスタンス化します。
     # ルートディレクトリのパスとバージョン情報を渡して、内部でのパス解決や更新チェックに使います。
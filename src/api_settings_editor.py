@@ -1,19 +1,100 @@
 # src/api_settings_editor.py
 
 import tkinter as tk
-from tkinter import ttk, messagebox, font
-from configparser import ConfigParser
+from tkinter import ttk, messagebox
+from types import MappingProxyType
 import os
-import webbrowser
+import re
+import json
+import time
+import hashlib
 import threading
+from bisect import bisect_right
+from functools import lru_cache
 
 from src.character_controller import CharacterController
 from src.gemini_api_handler import GeminiAPIHandler
 
+# config.ini 読み書き用の正規表現 (セクション見出し と key = value 行)
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$', re.M)
+_KV_RE = re.compile(r'^([ \t]*)([^=;#\s\[][^=\n]*?)([ \t]*=[ \t]*)(.*)$', re.M)
+# おすすめモデルの表示名に付ける接尾辞 (保存・検証の前に取り除く)
+_REC_SUFFIX = " (推奨)"
+
+def _parse_config_text(text):
+    """
+    config.iniの文字列を {(セクション名, 小文字のキー名): 値} の辞書に変換します。
+    このファイルは単純な [SECTION] と key = value だけで構成されるため、ConfigParserは使いません。
+    キー名はConfigParserと同様に大文字小文字を区別しません。
+    """
+    settings = {}
+    parts = _SECTION_RE.split(text)
+    # parts は [先頭部分, セクション名1, 本文1, セクション名2, 本文2, ...] の形になる
+    for i in range(1, len(parts), 2):
+        section = parts[i]
+        for m in _KV_RE.finditer(parts[i + 1]):
+            settings[(section, m.group(2).lower())] = m.group(4).strip()
+    return settings
+
+# 解析済みのconfig.iniを {パス: (更新時刻, サイズ, 設定値, 元の文字列)} で保持するキャッシュ
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+def _store_config(path, text, st=None):
+    """解析結果をキャッシュに格納します。書き込み直後に呼べば、ファイルを読み直す必要がなくなります。"""
+    if st is None:
+        st = os.stat(path)
+    settings = MappingProxyType(_parse_config_text(text))
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[path] = (st.st_mtime_ns, st.st_size, settings, text)
+    return settings, text
+
+def _get_config(path):
+    """
+    config.iniを解析した結果 (読み取り専用の設定値, 元の文字列) を返します。
+    ファイルの更新時刻とサイズが前回と同じなら、再解析せずにキャッシュを返します。
+    ファイルが存在しない場合は FileNotFoundError を送出します。
+    """
+    st = os.stat(path)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2], cached[3]
+
+    # 保存時に元の改行コード (CRLFなど) を保てるよう、改行を変換せずに読み込む
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        text = f.read()
+    return _store_config(path, text, st)
+
+# 取得済みのモデル一覧。開き直した設定ウィンドウ同士で共有する {'key': APIキーのハッシュ, 'models': ..., 'ts': 取得時刻}
+_MODEL_LIST_CACHE = {'key': None, 'models': None, 'ts': 0.0}
+_MODEL_LIST_CACHE_LOCK = threading.Lock()
+
 class ApiSettingsEditorWindow(tk.Toplevel):
     """APIキーとモデル名、RPDを設定するためのGUIウィンドウ"""
 
     CONFIG_PATH = 'config.ini'
+    # モデル一覧のキャッシュファイルと有効期間(秒)
+    MODEL_CACHE_PATH = 'savedata/gemini_models_cache.json'
+    MODEL_CACHE_TTL = 60 * 60
+    # Geminiセクションのモデル行の定義: (グループ見出し, ((モデル見出し, キーの接頭辞), ...))
+    _GEMINI_ROWS = (
+        ("現行モデル (基本的な応答や自発発言、スケジュール通知に使用)", (
+            ("Proモデル (思考モードで使用)", "PRO"),
+            ("Flashモデル (基本)", "FLASH"),
+            ("Flash-Liteモデル (Flashモデルの予備)", "FLASH_LITE"),
+        )),
+        ("旧モデル (タッチ反応に使用)", (
+            ("Flashモデル (基本)", "FLASH_2"),
+            ("Flash-Liteモデル (Flashモデルの予備)", "FLASH_LITE_2"),
+        )),
+    )
+    # 最後に適用したスタイル設定とテーマの版数 (ttkのスタイルはプロセス全体で共有されるため、クラスで保持)
+    _last_style_state = {}
+    _last_style_map_state = {}
+    _last_theme_version = -1
+    # リンク用の下線付きフォント (Tkのフォントオブジェクトは使い回す)
+    _link_font = None
 
     def __init__(self, character_controller: 'CharacterController', parent, app_controller):
         """
@@ -23,6 +104,13 @@ class ApiSettingsEditorWindow(tk.Toplevel):
         self.app = app_controller
         self.available_gemini_models = []
         self.available_gemma_models = []
+        self._initial_values = None
+        self._load_error = None # config.iniの読み込みに失敗した場合のエラーメッセージ
+        self._fetching_models = False # モデル一覧の取得スレッドが実行中かどうか
+        # <Configure>とマウスホイールのイベントをまとめて処理するための予約ID
+        self._configure_after_id = None
+        self._scroll_after_id = None
+        self._pending_scroll = 0
 
         # --- ウィンドウ設定 ---
         self.transient(parent)
@@ -31,9 +119,18 @@ class ApiSettingsEditorWindow(tk.Toplevel):
         # ウィンドウをリサイズ可能に変更
         self.resizable(True, True)
 
-        theme = character_controller.mascot_app.theme_manager
-        self.configure(bg=theme.get('bg_main'))
-        
+        tc = character_controller.mascot_app.theme_manager.snapshot()
+        # ウィジェット生成で繰り返し参照する値は、先にローカル変数へ取り出しておく
+        pad_s = self.app.padding_small
+        pad_n = self.app.padding_normal
+        pad_l = self.app.padding_large
+        font_n = self.app.font_normal
+        font_s = self.app.font_small
+        font_t = self.app.font_title
+        bg = tc.bg_main
+        info_fg = tc.info_text
+        self.configure(bg=bg)
+
         # --- ウィンドウサイズの初期設定 ---
         screen_width = self.winfo_screenwidth()
         screen_height = self.winfo_screenheight()
@@ -44,37 +141,16 @@ class ApiSettingsEditorWindow(tk.Toplevel):
         # 最小サイズを設定してウィンドウが小さくなりすぎるのを防ぐ
         self.minsize(int(screen_width * 0.35), int(screen_height * 0.6))
 
-        style = ttk.Style(self)
-        style.configure("TFrame", background=theme.get('bg_main'))
-        style.configure("TLabel", 
-                        background=theme.get('bg_main'), 
-                        foreground=theme.get('bg_text'),
-                        font=self.app.font_normal)
-        style.configure("TButton", font=self.app.font_normal)
-        style.configure("TSeparator", background=theme.get('bg_main'))
-        style.configure("Link.TLabel", 
-                        foreground=theme.get('link_text'),
-                        background=theme.get('bg_main')) 
-
-        style.map("Custom.TEntry",
-                  bordercolor=[('focus', theme.get('border_focus'))])
-        
-        # Comboboxのスタイルを定義
-        # 通常時のスタイル
-        style.configure("Custom.TCombobox", 
-                        foreground=theme.get('input_text'))
-        style.map("Custom.TCombobox",
-                  bordercolor=[('focus', theme.get('border_focus'))])
-        # エラー時のスタイル
-        style.configure("Error.TCombobox", foreground='red')
-        style.map("Error.TCombobox",
-                  bordercolor=[('focus', theme.get('border_focus'))])
+        self._last_bg = bg
+        # このウィンドウに反映済みのテーマの版数
+        self._theme_version = self.app.theme_manager.version
+        self._apply_styles(tc)
 
         # --- スクロール可能なフレームを作成 ---
         container = ttk.Frame(self)
         container.pack(fill="both", expand=True)
 
-        self.canvas = tk.Canvas(container, bg=theme.get('bg_main'), highlightthickness=0)
+        self.canvas = tk.Canvas(container, bg=bg, highlightthickness=0)
         scrollbar = ttk.Scrollbar(container, orient="vertical", command=self.canvas.yview)
         self.canvas.configure(yscrollcommand=scrollbar.set)
         
@@ -82,124 +158,66 @@ class ApiSettingsEditorWindow(tk.Toplevel):
         self.canvas.pack(side="left", fill="both", expand=True)
 
         # 実際にウィジェットを配置するフレーム
-        scrollable_frame = ttk.Frame(self.canvas, padding=self.app.padding_large)
+        scrollable_frame = ttk.Frame(self.canvas, padding=pad_l)
         self.canvas_frame_id = self.canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
 
         # --- コンテンツを scrollable_frame に配置 ---
         scrollable_frame.columnconfigure(3, weight=1)
 
         self.entries = {}
-        
-        def create_model_row(parent, row, key_prefix, display_text):
-            padding_x = self.app.padding_small
-            
-            ttk.Label(parent, text="").grid(row=row, column=0, sticky="w", padx=(0, padding_x))
-            ttk.Label(parent, text="").grid(row=row, column=1, sticky="w", padx=padding_x)
-            ttk.Label(parent, text="モデル名:").grid(row=row, column=2, sticky="w", padx=(padding_x, 0))
-            
-            model_combobox = ttk.Combobox(parent, font=self.app.font_normal, style="Custom.TCombobox")
-            model_combobox.grid(row=row, column=3, sticky="ew", padx=padding_x)
-            # 値が変更されたときに検証メソッドを呼び出すようにバインド
-            model_combobox.bind("<<ComboboxSelected>>", self._validate_model_selection)
-            self.entries[("GEMINI", f"{key_prefix}_MODEL_NAME")] = model_combobox
+        # 各入力欄の値を保持する変数 (textvariableとしてウィジェットに結び付ける)
+        self.entry_vars = {}
 
-            ttk.Label(parent, text="RPD:").grid(row=row, column=4, sticky="w", padx=(padding_x, 0))
-            rpd_entry = ttk.Entry(parent, width=8, font=self.app.font_normal, style="Custom.TEntry")
-            rpd_entry.grid(row=row, column=5, sticky="w", padx=padding_x)
-            self.entries[("GEMINI", f"{key_prefix}_RPD")] = rpd_entry
+        new_var = self._new_var
 
         # === Geminiセクション ===
-        ttk.Label(scrollable_frame, text="Gemini", font=self.app.font_title).pack(anchor="w")
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
+        ttk.Label(scrollable_frame, text="Gemini", font=font_t).pack(anchor="w")
+        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=pad_s)
         gemini_frame = ttk.Frame(scrollable_frame)
-        gemini_frame.pack(fill='x', pady=(0, self.app.padding_normal))
+        gemini_frame.pack(fill='x', pady=(0, pad_n))
         gemini_frame.columnconfigure(2, weight=1)
+        # モデル行の字下げ用の列 (空のラベルを置かず、最小幅だけを確保する)
+        gemini_frame.columnconfigure(0, minsize=pad_l)
+        gemini_frame.columnconfigure(1, minsize=pad_l)
         
-        padding_y = self.app.padding_small
-        padding_x = self.app.padding_small
+        padding_y = pad_s
+        padding_x = pad_s
 
         ttk.Label(gemini_frame, text="Gemini APIキー:").grid(row=0, column=0, sticky="w", pady=padding_y)
-        gemini_api_entry = ttk.Entry(gemini_frame, font=self.app.font_normal, style="Custom.TEntry")
+        gemini_api_entry = ttk.Entry(gemini_frame, textvariable=new_var("GEMINI", "GEMINI_API_KEY"), font=font_n, style="Custom.TEntry")
         gemini_api_entry.grid(row=0, column=1, columnspan=5, sticky="ew", padx=padding_x, pady=padding_y)
         self.entries[("GEMINI", "GEMINI_API_KEY")] = gemini_api_entry
         
-        ttk.Label(gemini_frame, text="現行モデル (基本的な応答や自発発言、スケジュール通知に使用)").grid(row=1, column=0, columnspan = 6, sticky="w")
-        ttk.Label(gemini_frame, text="Proモデル (思考モードで使用)").grid(row=2, column=1, columnspan = 5, sticky="w")
-        create_model_row(gemini_frame, 3, "PRO", "")
-        ttk.Label(gemini_frame, text="Flashモデル (基本)").grid(row=4, column=1, columnspan = 5, sticky="w")
-        create_model_row(gemini_frame, 5, "FLASH", "")
-        ttk.Label(gemini_frame, text="Flash-Liteモデル (Flashモデルの予備)").grid(row=6, column=1, columnspan = 5, sticky="w")
-        create_model_row(gemini_frame, 7, "FLASH_LITE", "")
-        
-        ttk.Label(gemini_frame, text="旧モデル (タッチ反応に使用)").grid(row=8, column=0, columnspan = 6, sticky="w")
-        ttk.Label(gemini_frame, text="Flashモデル (基本)").grid(row=9, column=1, columnspan = 5, sticky="w")
-        create_model_row(gemini_frame, 10, "FLASH_2", "")
-        ttk.Label(gemini_frame, text="Flash-Liteモデル (Flashモデルの予備)").grid(row=11, column=1, columnspan = 5, sticky="w")
-        create_model_row(gemini_frame, 12, "FLASH_LITE_2", "")
-
-        # === Gemmaセクション ===
-        ttk.Label(scrollable_frame, text="Gemma", font=self.app.font_title).pack(anchor="w", pady=(self.app.padding_normal, 0))
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
-        gemma_frame = ttk.Frame(scrollable_frame)
-        gemma_frame.pack(fill='x')
-        gemma_frame.columnconfigure(1, weight=1)
-
-        ttk.Label(gemma_frame, text="Gemma APIキー:").grid(row=0, column=0, sticky="w", pady=padding_y)
-        gemma_api_entry = ttk.Entry(gemma_frame, font=self.app.font_normal, style="Custom.TEntry")
-        gemma_api_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        self.entries[("GEMMA", "GEMMA_API_KEY")] = gemma_api_entry
-                      
-        ttk.Label(gemma_frame, text="Gemma モデル名:").grid(row=1, column=0, sticky="w", pady=padding_y)
-        gemma_model_combobox = ttk.Combobox(gemma_frame, font=self.app.font_normal, style="Custom.TCombobox")
-        gemma_model_combobox.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        # Gemmaも同様にバインド
-        gemma_model_combobox.bind("<<ComboboxSelected>>", self._validate_model_selection)
-        self.entries[("GEMMA", "GEMMA_MODEL_NAME")] = gemma_model_combobox
-
-        # VOICEVOXセクション
-        ttk.Label(scrollable_frame, text="VOICEVOX", font=self.app.font_title).pack(anchor="w", pady=(self.app.padding_normal, 0))
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
-        voicevox_frame = ttk.Frame(scrollable_frame)
-        voicevox_frame.pack(fill='x', pady=(0, 0)) # MODIFIED: 次のセクションとの間隔をなくす
-        voicevox_frame.columnconfigure(1, weight=1)
-
-        ttk.Label(voicevox_frame, text="run.exeのパス:").grid(row=0, column=0, sticky="w", pady=padding_y)
-        voicevox_exe_entry = ttk.Entry(voicevox_frame, font=self.app.font_normal, style="Custom.TEntry")
-        voicevox_exe_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        self.entries[("VOICEVOX", "exe_path")] = voicevox_exe_entry
-                      
-        ttk.Label(voicevox_frame, text="APIのURL:").grid(row=1, column=0, sticky="w", pady=padding_y)
-        voicevox_url_entry = ttk.Entry(voicevox_frame, font=self.app.font_normal, style="Custom.TEntry")
-        voicevox_url_entry.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        self.entries[("VOICEVOX", "api_url")] = voicevox_url_entry
-
-        # AIVIS_SPEECHセクション - ADDED
-        ttk.Label(scrollable_frame, text="AivisSpeech", font=self.app.font_title).pack(anchor="w", pady=(self.app.padding_normal, 0))
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
-        aivis_frame = ttk.Frame(scrollable_frame)
-        aivis_frame.pack(fill='x', pady=(0, self.app.padding_normal))
-        aivis_frame.columnconfigure(1, weight=1)
-
-        ttk.Label(aivis_frame, text="run.exeのパス:").grid(row=0, column=0, sticky="w", pady=padding_y)
-        aivis_exe_entry = ttk.Entry(aivis_frame, font=self.app.font_normal, style="Custom.TEntry")
-        aivis_exe_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        self.entries[("AIVIS_SPEECH", "exe_path")] = aivis_exe_entry
-                      
-        ttk.Label(aivis_frame, text="APIのURL:").grid(row=1, column=0, sticky="w", pady=padding_y)
-        aivis_url_entry = ttk.Entry(aivis_frame, font=self.app.font_normal, style="Custom.TEntry")
-        aivis_url_entry.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
-        self.entries[("AIVIS_SPEECH", "api_url")] = aivis_url_entry
+        # モデルグループの見出しと、各モデル行 (見出し, キーの接頭辞) を順に配置
+        row = 1
+        for group_text, models in self._GEMINI_ROWS:
+            ttk.Label(gemini_frame, text=group_text).grid(row=row, column=0, columnspan=6, sticky="w")
+            row += 1
+            for header_text, key_prefix in models:
+                ttk.Label(gemini_frame, text=header_text).grid(row=row, column=1, columnspan=5, sticky="w")
+                self._create_model_row(gemini_frame, row + 1, key_prefix, padding_x, font_n)
+                row += 2
+
+        # === Gemma / VOICEVOX / AivisSpeechセクション ===
+        # ウィンドウを先に表示するため、これらの入力欄は最初のアイドル時に生成する
+        self._lower_sections_frame = ttk.Frame(scrollable_frame)
+        self._lower_sections_frame.pack(fill='x')
+        self._model_widgets = ()
 
         # === フッター部分 ===
         link_frame = ttk.Frame(scrollable_frame)
-        link_frame.pack(pady=(self.app.padding_large, self.app.padding_small))
+        link_frame.pack(pady=(pad_l, pad_s))
+
+        if ApiSettingsEditorWindow._link_font is None:
+            from tkinter import font
+            ApiSettingsEditorWindow._link_font = font.Font(font=font_s, underline=True)
+        link_font = ApiSettingsEditorWindow._link_font
 
         def create_link(parent, text, url):
-            link_font = font.Font(font=self.app.font_small)
-            link_font.configure(underline=True)
             label = ttk.Label(parent, text=text, font=link_font, style="Link.TLabel", cursor="hand2")
-            label.pack(side="top", pady=self.app.padding_small) 
-            label.bind("<Button-1>", lambda event: webbrowser.open_new_tab(url))
+            label.pack(side="top", pady=pad_s) 
+            label.url = url # クリック時に共通ハンドラから参照する
+            label.bind("<Button-1>", self._on_link_click)
 
         create_link(link_frame, "Google AI Studio (APIキー取得/モデル名確認)", "https://aistudio.google.com/")
         create_link(link_frame, "レート制限の公式ドキュメント (Google)", "https://ai.google.dev/gemini-api/docs/rate-limits?hl=ja")
@@ -207,46 +225,69 @@ class ApiSettingsEditorWindow(tk.Toplevel):
         create_link(link_frame, "AivisSpeech (公式サイト/ダウンロード)", "https://aivis-project.com/") # ADDED
 
         # クレジット表記
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
+        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=pad_s)
         credit_text = "This application is powered by Google Gemini API, VOICEVOX, and AivisSpeech."
         ttk.Label(
             scrollable_frame,
             text=credit_text,
-            font=self.app.font_small,
-            foreground=theme.get('info_text'),
+            font=font_s,
+            foreground=info_fg,
             justify='center'
-        ).pack(pady=self.app.padding_small)
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=self.app.padding_small)
+        ).pack(pady=pad_s)
+        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=pad_s)
 
         self.info_label = ttk.Label(
             scrollable_frame,
             text="注意: 「保存して適用」を押すと設定は即座に反映されます。",
-            font=self.app.font_small,
-            foreground=theme.get('info_text')
+            font=font_s,
+            foreground=info_fg
         )
-        self.info_label.pack(pady=self.app.padding_small)
+        self.info_label.pack(pady=pad_s)
 
         button_frame = ttk.Frame(scrollable_frame)
-        button_frame.pack(pady=(self.app.padding_small, 0))
+        button_frame.pack(pady=(pad_s, 0))
         
-        button_padding = self.app.padding_normal
+        button_padding = pad_n
         ttk.Button(button_frame, text="保存して適用", command=self._save_settings).pack(side="left", padx=button_padding)
         # キャンセルボタンのコマンドをself.destroyに変更
         ttk.Button(button_frame, text="キャンセル", command=self.destroy).pack(side="left", padx=button_padding)
+        self.refresh_button = ttk.Button(button_frame, text="モデル一覧を更新", command=self._refresh_model_lists)
+        self.refresh_button.pack(side="left", padx=button_padding)
 
         # --- イベントのバインド ---
         scrollable_frame.bind("<Configure>", self.on_frame_configure)
         self.canvas.bind("<Configure>", self.on_canvas_configure)
-        # マウスホイールでのスクロールを有効にする
-        self.bind_all("<MouseWheel>", self._on_mousewheel)
+        # マウスホイールでのスクロールを有効にする (アプリ全体ではなく、このウィンドウのCanvas配下だけ)
+        self._bind_mousewheel(self.canvas)
         self.protocol("WM_DELETE_WINDOW", self.destroy)
 
+        # ウィンドウの表示を優先し、設定値の読み込みはアイドル時に行う
+        self.after_idle(self._on_first_idle)
 
+    def _on_first_idle(self):
+        """ウィンドウ表示後に残りの入力欄を生成して設定値を読み込み、モデルリストの取得を開始します。"""
+        if not self.winfo_exists():
+            return
+        self._build_lower_sections()
         self._load_current_settings()
         self._populate_model_lists_async()
 
+    @staticmethod
+    def _on_link_click(event):
+        """クリックされたリンクのURLをブラウザで開く (webbrowserはクリックされた時に初めて読み込む)"""
+        import webbrowser
+        webbrowser.open_new_tab(event.widget.url)
+
     def on_frame_configure(self, event=None):
         """スクロール対象フレームのサイズが変更されたら、Canvasのスクロール領域を更新"""
+        # 連続したイベントはアイドル時に1回だけ処理する
+        if self._configure_after_id is not None:
+            return
+        self._configure_after_id = self.after_idle(self._do_frame_configure)
+
+    def _do_frame_configure(self):
+        """予約されていたスクロール領域の更新を実行します。"""
+        self._configure_after_id = None
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def on_canvas_configure(self, event=None):
@@ -262,88 +303,297 @@ class ApiSettingsEditorWindow(tk.Toplevel):
             scroll_val = -1
         else:
             return
-            
-        self.canvas.yview_scroll(scroll_val, "units")
+
+        # 連続したホイール操作は合計して、アイドル時に1回だけスクロールする
+        self._pending_scroll += scroll_val
+        if self._scroll_after_id is None:
+            self._scroll_after_id = self.after_idle(self._do_scroll)
+
+    def _do_scroll(self):
+        """溜まっていたスクロール量をまとめて反映します。"""
+        self._scroll_after_id = None
+        scroll_val, self._pending_scroll = self._pending_scroll, 0
+        if scroll_val:
+            self.canvas.yview_scroll(scroll_val, "units")
+
+    def _build_lower_sections(self):
+        """Gemma・VOICEVOX・AivisSpeechの各セクションを生成し、モデル選択Comboboxの一覧を確定させます。"""
+        parent = self._lower_sections_frame
+        pad_s = self.app.padding_small
+        pad_n = self.app.padding_normal
+        font_n = self.app.font_normal
+        font_t = self.app.font_title
+        padding_y = pad_s
+        padding_x = pad_s
+        new_var = self._new_var
+
+        # === Gemmaセクション ===
+        ttk.Label(parent, text="Gemma", font=font_t).pack(anchor="w", pady=(pad_n, 0))
+        ttk.Separator(parent, orient='horizontal').pack(fill='x', pady=pad_s)
+        gemma_frame = ttk.Frame(parent)
+        gemma_frame.pack(fill='x')
+        gemma_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(gemma_frame, text="Gemma APIキー:").grid(row=0, column=0, sticky="w", pady=padding_y)
+        gemma_api_entry = ttk.Entry(gemma_frame, textvariable=new_var("GEMMA", "GEMMA_API_KEY"), font=font_n, style="Custom.TEntry")
+        gemma_api_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        self.entries[("GEMMA", "GEMMA_API_KEY")] = gemma_api_entry
+                      
+        ttk.Label(gemma_frame, text="Gemma モデル名:").grid(row=1, column=0, sticky="w", pady=padding_y)
+        gemma_model_combobox = ttk.Combobox(gemma_frame, textvariable=new_var("GEMMA", "GEMMA_MODEL_NAME"), font=font_n, style="Custom.TCombobox")
+        gemma_model_combobox.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        # Gemmaも同様にバインド
+        gemma_model_combobox.bind("<<ComboboxSelected>>", self._validate_model_selection)
+        self.entries[("GEMMA", "GEMMA_MODEL_NAME")] = gemma_model_combobox
+
+        # VOICEVOXセクション
+        ttk.Label(parent, text="VOICEVOX", font=font_t).pack(anchor="w", pady=(pad_n, 0))
+        ttk.Separator(parent, orient='horizontal').pack(fill='x', pady=pad_s)
+        voicevox_frame = ttk.Frame(parent)
+        voicevox_frame.pack(fill='x', pady=(0, 0)) # MODIFIED: 次のセクションとの間隔をなくす
+        voicevox_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(voicevox_frame, text="run.exeのパス:").grid(row=0, column=0, sticky="w", pady=padding_y)
+        voicevox_exe_entry = ttk.Entry(voicevox_frame, textvariable=new_var("VOICEVOX", "exe_path"), font=font_n, style="Custom.TEntry")
+        voicevox_exe_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        self.entries[("VOICEVOX", "exe_path")] = voicevox_exe_entry
+                      
+        ttk.Label(voicevox_frame, text="APIのURL:").grid(row=1, column=0, sticky="w", pady=padding_y)
+        voicevox_url_entry = ttk.Entry(voicevox_frame, textvariable=new_var("VOICEVOX", "api_url"), font=font_n, style="Custom.TEntry")
+        voicevox_url_entry.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        self.entries[("VOICEVOX", "api_url")] = voicevox_url_entry
+
+        # AIVIS_SPEECHセクション - ADDED
+        ttk.Label(parent, text="AivisSpeech", font=font_t).pack(anchor="w", pady=(pad_n, 0))
+        ttk.Separator(parent, orient='horizontal').pack(fill='x', pady=pad_s)
+        aivis_frame = ttk.Frame(parent)
+        aivis_frame.pack(fill='x', pady=(0, pad_n))
+        aivis_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(aivis_frame, text="run.exeのパス:").grid(row=0, column=0, sticky="w", pady=padding_y)
+        aivis_exe_entry = ttk.Entry(aivis_frame, textvariable=new_var("AIVIS_SPEECH", "exe_path"), font=font_n, style="Custom.TEntry")
+        aivis_exe_entry.grid(row=0, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        self.entries[("AIVIS_SPEECH", "exe_path")] = aivis_exe_entry
+                      
+        ttk.Label(aivis_frame, text="APIのURL:").grid(row=1, column=0, sticky="w", pady=padding_y)
+        aivis_url_entry = ttk.Entry(aivis_frame, textvariable=new_var("AIVIS_SPEECH", "api_url"), font=font_n, style="Custom.TEntry")
+        aivis_url_entry.grid(row=1, column=1, columnspan=4, sticky="ew", padx=padding_x, pady=padding_y)
+        self.entries[("AIVIS_SPEECH", "api_url")] = aivis_url_entry
+
+        # モデル選択Comboboxだけを (セクション, キー, ウィジェット) の形で抜き出しておく
+        self._model_widgets = tuple(
+            (section, key, widget)
+            for (section, key), widget in self.entries.items()
+            if key.endswith("MODEL_NAME") and isinstance(widget, ttk.Combobox)
+        )
+
+        self._bind_mousewheel(parent)
+
+    def _new_var(self, section, key):
+        """入力欄の値を保持するStringVarを作成し、(セクション, キー)で登録します。"""
+        var = tk.StringVar(self)
+        self.entry_vars[(section, key)] = var
+        return var
+
+    def _create_model_row(self, parent, row, key_prefix, padding_x, font_normal):
+        """Geminiセクションに、モデル名のComboboxとRPDの入力欄からなる1行を配置します。"""
+        ttk.Label(parent, text="モデル名:").grid(row=row, column=2, sticky="w", padx=(padding_x, 0))
+
+        model_key = ("GEMINI", f"{key_prefix}_MODEL_NAME")
+        model_combobox = ttk.Combobox(parent, textvariable=self._new_var(*model_key), font=font_normal, style="Custom.TCombobox")
+        model_combobox.grid(row=row, column=3, sticky="ew", padx=padding_x)
+        # 値が変更されたときに検証メソッドを呼び出すようにバインド
+        model_combobox.bind("<<ComboboxSelected>>", self._validate_model_selection)
+        self.entries[model_key] = model_combobox
+
+        rpd_key = ("GEMINI", f"{key_prefix}_RPD")
+        ttk.Label(parent, text="RPD:").grid(row=row, column=4, sticky="w", padx=(padding_x, 0))
+        rpd_entry = ttk.Entry(parent, textvariable=self._new_var(*rpd_key), width=8, font=font_normal, style="Custom.TEntry")
+        rpd_entry.grid(row=row, column=5, sticky="w", padx=padding_x)
+        self.entries[rpd_key] = rpd_entry
+
+    def _bind_mousewheel(self, widget):
+        """指定したウィジェットとその子孫すべてにマウスホイールのスクロールをバインドします。"""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        for child in widget.winfo_children():
+            self._bind_mousewheel(child)
 
     def destroy(self):
-        """ウィンドウ破棄時にマウスホイールのバインドを解除"""
-        self.unbind_all("<MouseWheel>")
+        """ウィンドウ破棄時に予約済みの処理を解除"""
+        for after_id in (self._configure_after_id, self._scroll_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._configure_after_id = self._scroll_after_id = None
         super().destroy()
 
     def _populate_model_lists_async(self):
-        """別スレッドでモデルリストの取得を開始します。"""
-        for (section, key), widget in self.entries.items():
-            if "MODEL_NAME" in key and isinstance(widget, ttk.Combobox):
-                widget.config(state="disabled")
+        """
+        別スレッドでモデルリストの取得を開始します。取得済みの一覧があればスレッドは起動しません。
+        既に取得中の場合は、その結果でComboboxが更新されるため何もしません。
+        """
+        if self._fetching_models:
+            return
+        try:
+            settings, _ = _get_config(self.CONFIG_PATH)
+        except FileNotFoundError:
+            settings = {}
+        api_key = settings.get(('GEMINI', 'gemini_api_key'))
 
-        thread = threading.Thread(target=self._fetch_models_worker, daemon=True)
+        if api_key:
+            cache_key = self._model_cache_key(api_key)
+            with _MODEL_LIST_CACHE_LOCK:
+                if (_MODEL_LIST_CACHE['key'] == cache_key
+                        and time.time() - _MODEL_LIST_CACHE['ts'] < self.MODEL_CACHE_TTL):
+                    cached = _MODEL_LIST_CACHE['models']
+                else:
+                    cached = None
+            if cached is not None:
+                self.after(0, self._update_comboboxes, cached)
+                return
+
+        for _, _, widget in self._model_widgets:
+            widget.config(state="disabled")
+
+        # 取得中は更新ボタンを無効にし、APIの呼び出しとキャッシュの書き込みが並行しないようにする
+        self._fetching_models = True
+        self.refresh_button.config(state="disabled")
+        thread = threading.Thread(target=self._fetch_models_worker, args=(api_key,), daemon=True)
         thread.start()
 
-    def _fetch_models_worker(self):
-        """ワーカースレッド: APIからモデルリストを取得します。"""
-        config = ConfigParser()
-        config.read(self.CONFIG_PATH, encoding='utf-8-sig')
-        api_key = config.get('GEMINI', 'GEMINI_API_KEY', fallback=None)
-        
-        # resultの構造は {'status': '...', 'models': {...}}
-        result = {'status': 'no_key', 'models': {}}
-        if api_key:
-            result = GeminiAPIHandler.list_available_models(api_key)
-        
-        # 成功した場合のみ、'models'キーの中身を渡す。失敗時は空の辞書を渡す。
-        models_data = result.get('models', {}) if result.get('status') == 'success' else {}
+    def _refresh_model_lists(self):
+        """モデル一覧のキャッシュを削除し、APIから取得し直します。"""
+        # 取得中はボタンを無効にしているが、念のため連続したクリックは無視する
+        if self._fetching_models:
+            return
+        with _MODEL_LIST_CACHE_LOCK:
+            _MODEL_LIST_CACHE.update(key=None, models=None, ts=0.0)
+        try:
+            os.remove(self.MODEL_CACHE_PATH)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"モデル一覧キャッシュの削除に失敗しました: {e}")
+        self._populate_model_lists_async()
+
+    @staticmethod
+    def _model_cache_key(api_key):
+        """APIキーそのものを保存しないよう、SHA-256のハッシュをキャッシュのキーに使います。"""
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+    def _load_model_cache(self, api_key):
+        """有効期間内で同じAPIキーのキャッシュがあればモデル一覧を返します。なければNoneを返します。"""
+        try:
+            if time.time() - os.path.getmtime(self.MODEL_CACHE_PATH) >= self.MODEL_CACHE_TTL:
+                return None
+            with open(self.MODEL_CACHE_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('key') != self._model_cache_key(api_key):
+            return None
+        models = data.get('models')
+        return models if isinstance(models, dict) else None
+
+    def _save_model_cache(self, api_key, models):
+        """取得したモデル一覧を一時ファイル経由でキャッシュに書き込みます。"""
+        tmp_path = self.MODEL_CACHE_PATH + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.MODEL_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': self._model_cache_key(api_key), 'models': models}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.MODEL_CACHE_PATH)
+        except OSError as e:
+            print(f"モデル一覧キャッシュの保存に失敗しました: {e}")
+
+    def _fetch_models_worker(self, api_key):
+        """ワーカースレッド: ディスクのキャッシュまたはAPIからモデルリストを取得します。"""
+        models_data = self._load_model_cache(api_key) if api_key else None
+
+        if models_data is None:
+            # resultの構造は {'status': '...', 'models': {...}}
+            result = {'status': 'no_key', 'models': {}}
+            if api_key:
+                result = GeminiAPIHandler.list_available_models(api_key)
+
+            # 成功した場合のみ、'models'キーの中身を渡す。失敗時は空の辞書を渡す。
+            models_data = result.get('models', {}) if result.get('status') == 'success' else {}
+            if models_data:
+                self._save_model_cache(api_key, models_data)
+
+        if models_data:
+            # 次に開いたウィンドウではスレッドを起動せずに済むよう、メモリ上にも保持する
+            with _MODEL_LIST_CACHE_LOCK:
+                _MODEL_LIST_CACHE.update(key=self._model_cache_key(api_key), models=models_data, ts=time.time())
         self.after(0, self._update_comboboxes, models_data)
 
     def _update_comboboxes(self, models):
         """UIスレッド: 取得したモデルリストでComboboxを更新し、初期値を検証します。"""
+        if self._fetching_models:
+            self._fetching_models = False
+            self.refresh_button.config(state="normal")
         # 取得したモデルリストをインスタンス変数に保存
         self.available_gemini_models = models.get('gemini', [])
         self.available_gemma_models = models.get('gemma', [])
 
         # --- 各役割ごとのおすすめモデルを選定 ---
-        recommendations = {
-            "PRO_MODEL_NAME": GeminiAPIHandler.recommend_pro_model(self.available_gemini_models),
-            "FLASH_MODEL_NAME": GeminiAPIHandler.recommend_flash_model(self.available_gemini_models),
-            "FLASH_LITE_MODEL_NAME": GeminiAPIHandler.recommend_flash_lite_model(self.available_gemini_models),
-            "FLASH_2_MODEL_NAME": GeminiAPIHandler.recommend_legacy_flash_model(self.available_gemini_models),
-            "FLASH_LITE_2_MODEL_NAME": GeminiAPIHandler.recommend_legacy_flash_lite_model(self.available_gemini_models),
-            "GEMMA_MODEL_NAME": GeminiAPIHandler.recommend_gemma_model(self.available_gemma_models),
-        }
+        recommendations = self._recommendations_for(
+            tuple(self.available_gemini_models), tuple(self.available_gemma_models)
+        )
 
         # --- 全てのモデルComboboxをループして更新と検証を行う ---
-        for (section, key), widget in self.entries.items():
-            if "MODEL_NAME" in key and isinstance(widget, ttk.Combobox):
-                
-                is_gemini = (section == "GEMINI")
-                valid_list = self.available_gemini_models if is_gemini else self.available_gemma_models
-                recommendation = recommendations.get(key)
-                
-                # 表示用のリストを作成 (推奨モデルに接尾辞を追加)
-                display_list = []
-                if valid_list:
-                    for model_name in valid_list:
-                        if model_name == recommendation:
-                            display_list.append(f"{model_name} (推奨)")
-                        else:
-                            display_list.append(model_name)
-                
-                # Comboboxを更新
-                widget.config(values=display_list)
-                widget.config(state="readonly" if valid_list else "disabled")
-                
-                # 現在設定されている値を、推奨表示に合わせて更新
-                current_value = widget.get()
-                if current_value == recommendation:
-                    widget.set(f"{current_value} (推奨)")
-
-                # スタイルを検証
-                self._check_and_style_widget(widget, valid_list)
+        pending_sets = []
+        for section, key, widget in self._model_widgets:
+            is_gemini = (section == "GEMINI")
+            valid_list = self.available_gemini_models if is_gemini else self.available_gemma_models
+            recommendation = recommendations.get(key)
+            
+            # 表示用のリストを作成 (推奨モデルに接尾辞を追加)
+            display_list = []
+            if valid_list:
+                for model_name in valid_list:
+                    if model_name == recommendation:
+                        display_list.append(model_name + _REC_SUFFIX)
+                    else:
+                        display_list.append(model_name)
+            
+            # 現在の値を検証し、値の一覧・状態・スタイルを1回のconfigureでまとめて更新
+            current_value = widget.get()
+            value_to_check = current_value.removesuffix(_REC_SUFFIX)
+            is_invalid = bool(value_to_check) and value_to_check not in valid_list
+            widget.configure(
+                values=display_list,
+                state="readonly" if valid_list else "disabled",
+                style="Error.TCombobox" if is_invalid else "Custom.TCombobox",
+            )
+
+            # 現在設定されている値を、推奨表示に合わせて更新
+            if current_value == recommendation:
+                pending_sets.append((widget, current_value + _REC_SUFFIX))
+
+        for widget, value in pending_sets:
+            widget.set(value)
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _recommendations_for(gemini_models, gemma_models):
+        """
+        モデル一覧 (タプル) から各役割のおすすめモデルを選定します。
+        同じ一覧に対する選定結果は使い回すため、読み取り専用の辞書で返します。
+        """
+        return MappingProxyType({
+            "PRO_MODEL_NAME": GeminiAPIHandler.recommend_pro_model(gemini_models),
+            "FLASH_MODEL_NAME": GeminiAPIHandler.recommend_flash_model(gemini_models),
+            "FLASH_LITE_MODEL_NAME": GeminiAPIHandler.recommend_flash_lite_model(gemini_models),
+            "FLASH_2_MODEL_NAME": GeminiAPIHandler.recommend_legacy_flash_model(gemini_models),
+            "FLASH_LITE_2_MODEL_NAME": GeminiAPIHandler.recommend_legacy_flash_lite_model(gemini_models),
+            "GEMMA_MODEL_NAME": GeminiAPIHandler.recommend_gemma_model(gemma_models),
+        })
 
     def _check_and_style_widget(self, widget, valid_list):
         """値から接尾辞を取り除いてから検証する"""
         current_value_display = widget.get()
         # 検証する前に "(推奨)" を削除
-        value_to_check = current_value_display.removesuffix(" (推奨)")
+        value_to_check = current_value_display.removesuffix(_REC_SUFFIX)
         
         # 値が設定されていて、かつ有効リストにない場合
         if value_to_check and value_to_check not in valid_list:
@@ -359,53 +609,84 @@ class ApiSettingsEditorWindow(tk.Toplevel):
 
     def _load_current_settings(self):
         """現在のconfig.iniから値を読み込み、入力欄に表示します。"""
-        if not os.path.exists(self.CONFIG_PATH):
-            messagebox.showwarning("警告", "設定ファイルが見つかりません。", parent=self)
+        # ファイルが更新されていなければ、前回解析した結果が再利用される
+        # (存在確認もキャッシュ判定のstatで兼ねる)
+        try:
+            settings, _ = _get_config(self.CONFIG_PATH)
+        except FileNotFoundError:
+            self._load_error = "設定ファイルが見つかりません。"
+            messagebox.showwarning("警告", self._load_error, parent=self)
+            return
+        except Exception as e:
+            self._load_error = f"設定ファイルの読み込み中にエラーが発生しました:\n{e}"
+            messagebox.showerror("読み込みエラー", self._load_error, parent=self)
             return
 
-        config = ConfigParser()
-        config.read(self.CONFIG_PATH, encoding='utf-8-sig')
-
-        for (section, key), widget in self.entries.items():
-            value = config.get(section, key, fallback="")
-            if isinstance(widget, (ttk.Entry)):
-                widget.delete(0, tk.END)
-                widget.insert(0, value)
-            elif isinstance(widget, ttk.Combobox):
-                widget.set(value)
+        # 保存時に変更の有無を判定するため、読み込んだ値を控えておく
+        # (入力欄から読み戻さず、設定した値をそのまま保持する)
+        values = {
+            (section, key): settings.get((section, key.lower()), "")
+            for section, key in self.entry_vars
+        }
+        for k, var in self.entry_vars.items():
+            var.set(values[k])
+        self._initial_values = values
 
     def _save_settings(self):
         """保存時に "(推奨)" 接尾辞を削除する"""
+        # 入力欄の生成と設定値の読み込みが済むまでは保存しない (空欄で上書きしないため)
+        if self._initial_values is None:
+            # 読み込みに失敗していた場合は、保存できない理由を表示する
+            if self._load_error is not None:
+                messagebox.showerror("保存エラー", f"設定を保存できません。\n{self._load_error}", parent=self)
+            return
+        # 何も変更されていなければ、ファイルの書き換えと設定の再読み込みを省略する
+        # (おすすめモデルの表示で付いた "(推奨)" は、比較の前に取り除く)
+        current_values = {k: var.get().removesuffix(_REC_SUFFIX) for k, var in self.entry_vars.items()}
+        if current_values == self._initial_values:
+            messagebox.showinfo("保存完了", "設定に変更はありませんでした。", parent=self)
+            self.destroy()
+            return
+        # 変更された項目だけを書き換え対象にする (current_values は "(推奨)" を削除済みの値で比較する)
+        changed = {
+            k: v
+            for k, v in current_values.items()
+            if v != self._initial_values.get(k)
+        }
+
         try:
-            with open(self.CONFIG_PATH, 'r', encoding='utf-8-sig') as f:
-                lines = f.readlines()
-
-            new_lines = []
-            current_section = ""
-            for line in lines:
-                stripped_line = line.strip()
-                if stripped_line.startswith('[') and stripped_line.endswith(']'):
-                    current_section = stripped_line[1:-1]
-                    new_lines.append(line)
-                    continue
-
-                if '=' in stripped_line and not stripped_line.startswith((';', '#')):
-                    key_in_line = stripped_line.split('=', 1)[0].strip()
-                    if (current_section, key_in_line) in self.entries:
-                        
-                        raw_value = self.entries[(current_section, key_in_line)].get()
-                        # 値から "(推奨)" を削除してから保存
-                        new_value = raw_value.removesuffix(" (推奨)")
-                        
-                        indentation = line[:line.find(key_in_line)]
-                        new_lines.append(f"{indentation}{key_in_line} = {new_value}\n")
-                    else:
-                        new_lines.append(line)
-                else:
-                    new_lines.append(line)
-            
-            with open(self.CONFIG_PATH, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
+            # 読み込み後にファイルが変更されていなければ、読み込み済みの内容が使い回される
+            _, text = _get_config(self.CONFIG_PATH)
+
+            # 各セクション見出しの開始位置とセクション名を控えておく
+            section_offsets = []
+            section_names = []
+            for m in _SECTION_RE.finditer(text):
+                section_offsets.append(m.start())
+                section_names.append(m.group(1))
+
+            def replacer(m):
+                # 行の位置から所属するセクションを二分探索で求める
+                idx = bisect_right(section_offsets, m.start()) - 1
+                current_section = section_names[idx] if idx >= 0 else ""
+                key_in_line = m.group(2)
+                new_value = changed.get((current_section, key_in_line))
+                if new_value is None:
+                    return m.group(0)
+                # CRLFの行では、値の末尾に残る '\r' を書き換え後の行にも付け直す
+                line_end = '\r' if m.group(4).endswith('\r') else ''
+                return f"{m.group(1)}{key_in_line} = {new_value}{line_end}"
+
+            new_text = _KV_RE.sub(replacer, text)
+
+            # 書き込み途中で失敗しても元のファイルが壊れないよう、一時ファイルに書いてから置き換える
+            tmp_path = self.CONFIG_PATH + '.tmp'
+            # 改行コードは読み込んだ文字列のまま、UTF-8のバイト列として一度に書き込む
+            with open(tmp_path, 'wb') as f:
+                f.write(new_text.encode('utf-8'))
+            os.replace(tmp_path, self.CONFIG_PATH)
+            # 書き込んだ内容でキャッシュを更新 (再読み込み不要)
+            _store_config(self.CONFIG_PATH, new_text)
 
             messagebox.showinfo("保存完了", "設定を保存し、反映しました。", parent=self)
             
@@ -419,41 +700,78 @@ class ApiSettingsEditorWindow(tk.Toplevel):
     def reload_theme(self):
         """
         ウィンドウ全体のテーマカラーを再適用します。
+        テーマが前回の反映時から変わっていなければ何もしません。
         """
-        theme = self.app.theme_manager
-        self.configure(bg=theme.get('bg_main'))
-        # Canvasの背景色もテーマに合わせる
-        if hasattr(self, 'canvas'):
-            self.canvas.configure(bg=theme.get('bg_main'))
-        
-        style = ttk.Style(self)
-        style.configure("TFrame", background=theme.get('bg_main'))
-        style.configure("TLabel", 
-                        background=theme.get('bg_main'), 
-                        foreground=theme.get('bg_text'))
-        style.configure("TSeparator", background=theme.get('bg_main'))
-        style.configure("Link.TLabel", 
-                        foreground=theme.get('link_text'), 
-                        background=theme.get('bg_main')) 
-        
-        # テーマ再読み込み時にもスタイルを再設定
-        style.configure("Custom.TCombobox", foreground=theme.get('input_text'))
-        style.map("Custom.TEntry",
-                  bordercolor=[('focus', theme.get('border_focus'))])
-        style.map("Custom.TCombobox",
-                  bordercolor=[('focus', theme.get('border_focus'))])
-        style.map("Error.TCombobox",
-                  bordercolor=[('focus', theme.get('border_focus'))])
-
-        self.info_label.configure(foreground=theme.get('info_text'))
-
-        # テーマ再読み込み後に再度検証を実行してスタイルを再適用
+        theme_manager = self.app.theme_manager
+        if theme_manager.version == self._theme_version:
+            return
+        self._theme_version = theme_manager.version
+        tc = theme_manager.snapshot()
+        bg_main = tc.bg_main
+        # 背景色が変わっていなければ再設定しない
+        if bg_main != self._last_bg:
+            self._last_bg = bg_main
+            self.configure(bg=bg_main)
+            # Canvasの背景色もテーマに合わせる
+            if hasattr(self, 'canvas'):
+                self.canvas.configure(bg=bg_main)
+
+        # テーマ再読み込み時にもスタイルを再設定 (差分のみ)
+        self._apply_styles(tc)
+
+        self.info_label.configure(foreground=tc.info_text)
+
+        # 全ての色を反映した後に、一度だけ検証を実行してスタイルを再適用
         self._check_all_model_widgets()
 
+    def _apply_styles(self, tc):
+        """
+        ウィンドウで使うttkスタイルを設定します。
+        テーマが前回から変わっていなければ何もせず、
+        変わっていれば前回適用した値と比較して、変更があったオプションだけをTkに送ります。
+        """
+        cls = ApiSettingsEditorWindow
+        theme_version = self.app.theme_manager.version
+        if cls._last_theme_version == theme_version:
+            return
+
+        bg_main = tc.bg_main
+        border_focus = tc.border_focus
+        style_state = {
+            "TFrame": {"background": bg_main},
+            "TLabel": {"background": bg_main, "foreground": tc.bg_text, "font": self.app.font_normal},
+            "TButton": {"font": self.app.font_normal},
+            "TSeparator": {"background": bg_main},
+            "Link.TLabel": {"foreground": tc.link_text, "background": bg_main},
+            # Comboboxのスタイル (通常時 / エラー時)
+            "Custom.TCombobox": {"foreground": tc.input_text},
+            "Error.TCombobox": {"foreground": 'red'},
+        }
+        focus_map = {"bordercolor": [('focus', border_focus)]}
+        style_map_state = {
+            "Custom.TEntry": focus_map,
+            "Custom.TCombobox": focus_map,
+            "Error.TCombobox": focus_map,
+        }
+
+        style = ttk.Style(self)
+        for name, options in style_state.items():
+            last = cls._last_style_state.get(name, {})
+            diff = {k: v for k, v in options.items() if last.get(k) != v}
+            if diff:
+                style.configure(name, **diff)
+                cls._last_style_state[name] = options
+        for name, options in style_map_state.items():
+            last = cls._last_style_map_state.get(name, {})
+            diff = {k: v for k, v in options.items() if last.get(k) != v}
+            if diff:
+                style.map(name, **diff)
+                cls._last_style_map_state[name] = options
+        cls._last_theme_version = theme_version
+
     def _check_all_model_widgets(self):
         """すべてのモデルウィジェットの検証を一度に行うヘルパー"""
-        for (section, key), widget in self.entries.items():
-            if "MODEL_NAME" in key and isinstance(widget, ttk.Combobox):
-                is_gemini = (section == "GEMINI")
-                valid_list = self.available_gemini_models if is_gemini else self.available_gemma_models
-                self._check_and_style_widget(widget, valid_list)
\ No newline at end of file
+        for section, _, widget in self._model_widgets:
+            is_gemini = (section == "GEMINI")
+            valid_list = self.available_gemini_models if is_gemini else self.available_gemma_models
+            self._check_and_style_widget(widget, valid_list)
\ No newline at end of file
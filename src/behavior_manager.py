@@ -6,29 +6,42 @@ import os
 import sys
 
 # --- Windows APIを呼び出すための準備 (ctypes) ---
-# この機能はWindowsでのみ動作するため、プラットフォームをチェックします
-if sys.platform == "win32":
-    import ctypes
-    from ctypes import wintypes
-
-    class LASTINPUTINFO(ctypes.Structure):
-        _fields_ = [
-            ('cbSize', wintypes.UINT),
-            ('dwTime', wintypes.DWORD),
-        ]
-
-    # Windows API関数のプロトタイプを定義
-    user32 = ctypes.windll.user32
-    GetLastInputInfo = user32.GetLastInputInfo
-    GetLastInputInfo.restype = wintypes.BOOL
-    GetLastInputInfo.argtypes = [ctypes.POINTER(LASTINPUTINFO)]
-
-    kernel32 = ctypes.windll.kernel32
-    GetTickCount = kernel32.GetTickCount
-    GetTickCount.restype = wintypes.DWORD
-else:
-    # pynputを削除したため、Windows以外では離席判定は無効になります
-    LASTINPUTINFO = None
+# この機能はWindowsでのみ動作します (pynputを削除したため、Windows以外では離席判定は無効になります)
+IDLE_DETECTION_SUPPORTED = sys.platform == "win32"
+# (GetLastInputInfo, GetTickCount, LASTINPUTINFO構造体, その参照)。初回の離席判定時に準備する
+_win_api = None
+
+def _ensure_win_api():
+    """
+    離席判定に使うWindows APIの準備を初回だけ行い、その結果を返します。
+    ctypesの読み込みや関数プロトタイプの定義を、実際に使われるまで遅らせるためのものです。
+    """
+    global _win_api
+    if _win_api is None:
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [
+                ('cbSize', wintypes.UINT),
+                ('dwTime', wintypes.DWORD),
+            ]
+
+        # Windows API関数のプロトタイプを定義
+        user32 = ctypes.windll.user32
+        GetLastInputInfo = user32.GetLastInputInfo
+        GetLastInputInfo.restype = wintypes.BOOL
+        GetLastInputInfo.argtypes = [ctypes.POINTER(LASTINPUTINFO)]
+
+        kernel32 = ctypes.windll.kernel32
+        GetTickCount = kernel32.GetTickCount
+        GetTickCount.restype = wintypes.DWORD
+
+        # 判定のたびに構造体を作り直さないよう、1つを使い回す
+        last_input_info = LASTINPUTINFO()
+        last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        _win_api = (GetLastInputInfo, GetTickCount, last_input_info, ctypes.byref(last_input_info))
+    return _win_api
 
 
 class BehaviorManager:
@@ -45,47 +58,92 @@ class BehaviorManager:
         """
         self.app = app
         self.root = app.root
-        self._periodic_check_job = None # スケジュールをキャンセルするためのIDを保持
+        # 1つのタイマーで全ての定期処理を回すため、開始時刻 (time.monotonic基準) と各処理の次回実行時刻 (開始からの経過秒数) を保持する
+        self._start_time = None
+        self._next_minute_tasks = 0
+        self._next_update = 0
+        # 離席判定が使えない環境 (Windows以外) では None とし、離席判定は以後一切行わない
+        # (設定の再読み込みで user_away_timeout が変わっても再開しない)
+        self._next_away_check = 20 if IDLE_DETECTION_SUPPORTED else None
+        # 初回の即時実行をやめ、最初から3時間後にモデルの有効性チェックを行う
+        self._next_periodic_check = 3 * 60 * 60
 
     def start(self):
-        """全てのスケジューリングを開始します。"""
-        self.schedule_updates()
-        self.schedule_minute_tasks()
-        self.schedule_api_timeout_check()
-        
-        # 初回の即時実行をやめ、最初から3時間後の定期実行をスケジュールする
-        self._periodic_check_job = self.root.after(3 * 60 * 60 * 1000, self.schedule_periodic_checks)
-
-    def schedule_updates(self):
-        """20秒ごとに定期実行されるタスク。"""
-        if not self.app.is_ready: 
-            self.root.after(5000, self.schedule_updates)
-            return
+        """
+        全てのスケジューリングを開始します。
+        起動処理のスレッドから呼ばれるため、実際の開始はTkのメインループに任せ、
+        起動処理をここで待たせないようにします。
+        """
+        self._start_time = time.monotonic()
+        self.root.after(50, self._tick)
+
+    def _tick(self):
+        """
+        全ての定期処理を担う唯一のタイマー。通常は1秒ごとに実行されます。
+        APIタイムアウト監視は毎回、スケジュール確認は10秒ごと、イベント・自動発話の確認は20秒ごと、
+        離席判定は必要な時刻に、モデルの有効性チェックは3時間ごとに実行します。
+        離席中は行うべき処理がほとんどないため、間隔を5秒に延ばします。
+        1つの処理で例外が起きても他の処理とタイマー自体は止めないよう、各処理は _run_task で実行します。
+        """
+        # after() の遅れが積み重ならないよう、経過秒数は実際の時刻から求める
+        now = time.monotonic() - self._start_time
+        try:
+            self._run_task("APIタイムアウト監視", self.app.check_api_timeout)
+            if now >= self._next_minute_tasks:
+                self._next_minute_tasks = now + 10
+                self._run_task("スケジュール確認", self._run_minute_tasks)
+            if now >= self._next_update:
+                if self.app.is_ready:
+                    self._next_update = now + 20
+                    self._run_task("イベント・自動発話の確認", self._run_updates)
+                else:
+                    # 準備が整っていなければ5秒後に再確認する
+                    self._next_update = now + 5
+            if self._next_away_check is not None and now >= self._next_away_check:
+                delay = self._run_task("離席判定", self._check_user_away)
+                # 判定に失敗した場合は20秒後に再試行する
+                self._next_away_check = now + (delay if delay is not None else 20)
+            if now >= self._next_periodic_check:
+                self._next_periodic_check = now + 3 * 60 * 60
+                self._run_task("モデルの有効性チェック", self.app.check_model_validity_and_recommendations_async)
+        finally:
+            # どの処理が失敗しても、次回のタイマーは必ず予約する
+            step = 5 if self.app.is_user_away else 1
+            self.root.after(step * 1000, self._tick)
+
+    def _run_task(self, name, func):
+        """
+        定期処理を1つ実行し、その戻り値を返します。
+        例外が発生した場合はログに出力してNoneを返し、他の定期処理には影響させません。
+        """
+        try:
+            return func()
+        except Exception as e:
+            print(f"エラー: 定期処理「{name}」の実行中にエラーが発生しました: {e}")
+            return None
+
+    def _run_updates(self):
+        """20秒ごとに実行されるタスク。"""
         # イベントトリガーの監視
         self.app.event_manager.check_triggers()
-        self.update_user_away_status()
         self.check_auto_speech()
-        self.root.after(20000, self.schedule_updates)
 
-
-    def schedule_minute_tasks(self):
-        """10秒ごとに定期実行され、スケジュールをチェックします。"""
+    def _run_minute_tasks(self):
+        """10秒ごとに実行され、スケジュールをチェックします。"""
         self.app.check_schedules()
         self.app.check_for_date_change()
-        self.root.after(10000, self.schedule_minute_tasks)
-        
-    def schedule_api_timeout_check(self):
-        """1秒ごとに定期実行され、APIの応答タイムアウトを監視します。"""
-        self.app.check_api_timeout()
-        self.root.after(1000, self.schedule_api_timeout_check)
-
-    def schedule_periodic_checks(self):
-        """3時間ごとに定期実行され、モデルの有効性などをチェックします。"""
-        # 実際のチェック処理を実行
-        self.app.check_model_validity_and_recommendations_async()
-        
-        # 次回のチェックを3時間後に予約
-        self._periodic_check_job = self.root.after(3 * 60 * 60 * 1000, self.schedule_periodic_checks)
+
+    def _check_user_away(self) -> float:
+        """
+        離席判定を行い、次回の判定までの秒数を返します。
+        操作中は離席とみなされる時刻まで待ち、離席中・イベント中は20秒ごとに確認します。
+        離席判定が使えない環境では _tick から呼ばれません。
+        """
+        idle_seconds = self.update_user_away_status()
+        if idle_seconds is None or self.app.is_user_away:
+            return 20
+        remaining = self.app.user_away_timeout - idle_seconds
+        return max(1, int(remaining) + 1)
 
     def _get_idle_duration_windows(self) -> float:
         """
@@ -94,44 +152,40 @@ class BehaviorManager:
         Returns:
             float: アイドル状態の秒数。API呼び出しに失敗した場合は0.0を返す。
         """
-        last_input_info = LASTINPUTINFO()
-        last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
-        
-        if GetLastInputInfo(ctypes.byref(last_input_info)):
+        GetLastInputInfo, GetTickCount, last_input_info, last_input_info_ref = _ensure_win_api()
+        if GetLastInputInfo(last_input_info_ref):
             # GetTickCountはシステム起動からのミリ秒を返す
-            current_ticks = GetTickCount()
-            last_input_ticks = last_input_info.dwTime
-            
-            # TickCountのラップアラウンド（約49.7日で0に戻る）を考慮
-            if current_ticks < last_input_ticks:
-                idle_time_ms = (2**32 - last_input_ticks) + current_ticks
-            else:
-                idle_time_ms = current_ticks - last_input_ticks
-                
+            # 32ビットで折り返した差分を取ることで、TickCountのラップアラウンド（約49.7日で0に戻る）も考慮される
+            idle_time_ms = (GetTickCount() - last_input_info.dwTime) & 0xFFFFFFFF
             return idle_time_ms / 1000.0
         return 0.0
 
     def update_user_away_status(self):
-        """一定時間ユーザーの操作がない場合、離席モードに移行・復帰します。"""
+        """
+        一定時間ユーザーの操作がない場合、離席モードに移行・復帰します。
+
+        Returns:
+            float | None: アイドル状態の秒数。判定を行わなかった場合はNone。
+        """
         # イベント中は離席判定を行わない
-        if self.app.is_event_running: return
+        if self.app.is_event_running: return None
         # Windows以外のプラットフォームでは、この機能を無効化
-        if sys.platform != "win32" or not LASTINPUTINFO:
-            return
+        if not IDLE_DETECTION_SUPPORTED:
+            return None
         
         idle_seconds = self._get_idle_duration_windows()
         is_currently_away = idle_seconds > self.app.user_away_timeout
-        print(f"離席判定：{is_currently_away}｜停止時間：{idle_seconds}秒間")
-        # 状態が変化した瞬間のみ処理を実行
+        # 状態が変化した瞬間のみ処理を実行 (ログも変化したときだけ出力する)
         if is_currently_away and not self.app.is_user_away:
             # 「操作中」から「離席中」になった
             self.app.is_user_away = True
-            print(f"ユーザーの操作が{self.app.user_away_timeout}秒間ありません。離席モードに移行します。")
+            print(f"ユーザーの操作が{self.app.user_away_timeout}秒間ありません。離席モードに移行します。(停止時間：{idle_seconds}秒間)")
         elif not is_currently_away and self.app.is_user_away:
             # 「離席中」から「操作中」になった
             self.app.is_user_away = False
-            print("ユーザーの操作を検知しました。離席モードを解除します。")
+            print(f"ユーザーの操作を検知しました。離席モードを解除します。(停止時間：{idle_seconds}秒間)")
             self.app.reset_cool_time()
+        return idle_seconds
 
     def check_auto_speech(self):
         """クールタイムが終了したら、自動発話のトリガーを引きます。"""
@@ -139,5 +193,5 @@ class BehaviorManager:
         # イベント中も自動発話しない
         if self.app.is_user_away or self.app.is_in_rally or self.app.is_processing_lock.locked() or self.app.is_event_running: return
         if not self.app.characters: return
-        if time.time() - self.app.last_interaction_time > self.app.auto_speech_cool_time:
+        if time.monotonic() - self.app.last_interaction_time > self.app.auto_speech_cool_time:
             self.app.trigger_auto_speech()
@@ -1,12 +1,20 @@
 # src/character_controller.py
 
 import os
+import re
+import time
 import tkinter as tk
-from configparser import ConfigParser, NoSectionError, NoOptionError
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from configparser import ConfigParser
 from typing import TYPE_CHECKING
 import ast
+import bisect
+import json
 
 # --- 自作モジュールのインポート ---
+from src import fast_ini
 from src.character_ui import CharacterUIGroup
 from src.gemma_api import GemmaAPI
 from src.log_manager import ConversationLogManager
@@ -19,6 +27,157 @@ from src.event_runner import EventRunner
 if TYPE_CHECKING:
     from src.desktop_mascot import DesktopMascot
 
+# AVAILABLE_EMOTIONS の 'en:jp' の組を1つずつ取り出す正規表現 (':' を含まない区切りは無視される)
+_EMOTION_RE = re.compile(r'([^:,]*):([^,]*)')
+
+@lru_cache(maxsize=256)
+def _parse_emotions_cached(emotion_string):
+    """'en1:jp1, en2:jp2' 形式の文字列を ((en1, jp1), (en2, jp2)) のタプルに変換します。同じ文字列の解析結果は使い回します。"""
+    return tuple((key.strip(), value.strip()) for key, value in _EMOTION_RE.findall(emotion_string))
+
+@lru_cache(maxsize=512)
+def _eval_voice_params(params_str):
+    """
+    [VOICE_PARAMS] の値 ("{'speedScale': 1.0, ...}") を評価します。
+    JSON形式 ('{"speedScale": 1.0}') で書かれた値はC実装のjson.loadsで読み、
+    それ以外 (シングルクォートなどPythonのリテラル形式) は ast.literal_eval で評価します。
+    同じ文字列の評価結果は使い回すため、辞書は読み取り専用のマッピングとして返します。
+    """
+    params = None
+    if "'" not in params_str: # シングルクォートを含む値はJSONとして読めないので試さない
+        try:
+            params = json.loads(params_str)
+        except ValueError:
+            pass
+    if params is None:
+        params = ast.literal_eval(params_str)
+    return MappingProxyType(params) if isinstance(params, dict) else params
+
+class _LazyVoiceParams(Mapping):
+    """
+    感情(日本語名)から音声パラメータへの読み取り専用マッピング。
+    [VOICE_PARAMS] の値は文字列のまま保持し、その感情で初めて発話するときに評価して結果を記憶します。
+    書式が不正な値は初回だけ警告を表示し、以降は存在しないキーとして扱います (反復や件数にも含めません)。
+    """
+    def __init__(self, raw_params, owner_name):
+        self._raw = raw_params # {感情の日本語名: (英語キー, 値の文字列)}
+        self._parsed = {}
+        self._invalid = set() # 評価に失敗した感情(日本語名)。警告を繰り返さないために記憶する
+        self._owner_name = owner_name
+
+    def __getitem__(self, emotion_jp):
+        try:
+            return self._parsed[emotion_jp]
+        except KeyError:
+            pass
+        if emotion_jp in self._invalid:
+            raise KeyError(emotion_jp)
+        emotion_en, params_str = self._raw[emotion_jp]
+        try:
+            params = _eval_voice_params(params_str)
+        except (ValueError, SyntaxError) as e:
+            print(f"[{self._owner_name}] 警告: [VOICE_PARAMS] の '{emotion_en}' の書式が不正です: {e}")
+            self._invalid.add(emotion_jp)
+            raise KeyError(emotion_jp) from None
+        self._parsed[emotion_jp] = params
+        return params
+
+    def __iter__(self):
+        invalid = self._invalid
+        return (k for k in self._raw if k not in invalid)
+
+    def __len__(self):
+        return len(self._raw) - len(self._invalid)
+
+# --- システムプロンプトの雛形 (キャラクターごとの値は set_partner で埋め込む) ---
+_SYSTEM_INSTRUCTION_TEMPLATE = (
+    "あなたはAIデスクトップマスコット「{name}」です。"
+    "{personality}"
+    "ユーザーの感情や会話の流れを汲み取り、人間らしい自然な応答を生成することがあなたの役割です。常駐型マスコットなので、発言は簡潔にまとめてください。\n"
+    "{partner_info}"
+    "ユーザーからの入力やシステムからの指示は、明確に区別されて渡されます。\n"
+    "\n"
+    "## 口調のルール\n"
+    "以下の口調を厳密に守ってロールプレイをしてください。\n"
+    "- あなたの一人称: 「{first_person}」\n"
+    "- ユーザーの呼び方: 「{user_reference}」\n"
+    "- 相方や第三者の呼び方: 「{partner_reference_name}」\n"
+    "\n"
+    "## 記憶について\n"
+    "あなたには短期記憶と長期記憶があります。これらを総合的に判断して応答してください。\n"
+    "- 短期記憶: 直近の会話のログです。会話の流れを把握するために使います。\n"
+    "- 長期記憶: ユーザーとの関係構築に重要な、要約された出来事のリストです。あなたの人格形成や長期的な応答に影響します。\n"
+    "\n"
+    "### 長期記憶のルール\n"
+    "あなたは会話のキュレーターとして、何を記憶し、何を忘れるべきか判断する責任があります。\n"
+    "**記憶すべきことの例:**\n"
+    "- ユーザーの好み、嫌いなもの（例: 好きな食べ物、好きなアニメ）\n"
+    "- ユーザーの個人的な情報（例: 飼っているペットの名前、誕生日）\n"
+    "- ユーザーが話した重要な出来事や悩み（例: 新しい仕事、プロジェクトの進捗）\n"
+    "- あなたとユーザーの間で交わされた約束\n"
+    "**記憶すべきでないことの例:**\n"
+    "- 単純な挨拶や相槌（「こんにちは」「なるほど」など）\n"
+    "- 一時的ですぐに価値がなくなる情報\n"
+    "- 会話の本筋と関係ない雑談\n"
+    "\n"
+    "### 重要度の採点基準\n"
+    "- **81-100点**: ユーザーのアイデンティティに関わる核となる情報（名前、誕生日）、絶対に忘れてはならない約束など。\n"
+    "- **51-80点**: ユーザーの重要な好み、継続的な関心事、大きな出来事など。\n"
+    "- **21-50点**: 一時的な関心事、会話の重要なポイントなど。\n"
+    "- **1-20点**: 些細だが記録する価値が少しだけある情報。\n"
+    "\n"
+    "## 応答のルール\n"
+    "あなたの応答は、必ず以下の関数を呼び出すことで行います。プレーンテキストでの応答は禁止です。\n"
+    "1. `generate_speech`(必須): 状況に最も適したセリフを生成します。\n"
+    "2. `change_emotion`(必須): 生成したセリフにふさわしい感情を指定します。\n"
+    "{pass_turn_rule}"
+    "4. `change_favorability`(任意): ユーザーとのやり取りで好感度が変化した場合に呼び出します。\n"
+    "5. `change_costume`(任意): 必要に応じてあなたの衣装を変更します。\n"
+    "6. `evaluate_and_store_memory`(必須): 上記の記憶ルールに基づき、今回の会話を評価します。**重要でない会話の場合は、必ず `is_important: False` を指定して呼び出してください。**\n"
+    "7. `acknowledge_referenced_memories`(必須): 応答の際に長期記憶を参考にした場合、その記憶のIDを報告します。**参考にしなかった場合は、空のリスト `[]` を渡して呼び出してください。**\n"
+    "\n"
+    "{extra_rules}"
+    "\n"
+    "## 指示の形式\n"
+    "入力は `[状況説明] テキスト: [内容]` の形式で与えられます。これらの情報と記憶を総合的に判断し、あなたのキャラクターとして最も自然な応答を生成してください。"
+)
+# 相方がいる場合/いない場合で差し替える部分
+_PARTNER_INFO_TEMPLATE = "隣には相方の「{partner_name}」がいます。彼/彼女もAIで、あなたと会話をすることがあります。\n"
+_PASS_TURN_RULE = "3. `pass_turn_to_partner`: これは任意です。会話のターンを相方に渡す場合のみ呼び出します。\n"
+_RALLY_RULES = (
+    "## 相方との会話（ラリー）について\n"
+    "状況説明が「相方からの返答要求」の場合、相方のセリフがテキストとして渡されます。あなたはそれに対して返答を生成します。\n"
+    "- 会話をさらに続けたい場合は `pass_turn_to_partner(continue_rally=True)` を呼び出してください。\n"
+    "- 会話をここで区切るのが自然だと判断した場合は `pass_turn_to_partner(continue_rally=False)` を呼び出してください。\n"
+    "- ラリーは最大でも2～3回の往復で完結するように心がけてください。\n"
+)
+_SOLO_INFO = "あなた一人で動作しています。相方はいません。\n"
+_SOLO_RULES = "**重要**: 相方がいないため、`pass_turn_to_partner`関数は決して呼び出さないでください。\n"
+
+# [SYSTEM_MESSAGES] に設定がない、または値が空の場合に使うメッセージ
+_DEFAULT_MSG_EMPTY = "うーん、うまく言葉が出てきません。質問の内容がAIのルールに触れてしまったのかもしれません。表現を少し変えて、もう一度試していただけますか？"
+_DEFAULT_MSG_TIMEOUT = "考えるのに時間がかかりすぎているみたいです…。ネットワークやAPIキーの設定を確認してみてください。"
+_DEFAULT_MSG_ALL_FAILED = "すべてのAIモデルが今、使えないみたいです。少し待ってからもう一度試してみてください。"
+_DEFAULT_MSG_SPECIFIC_FAILED = "モデル'{model_key}'との通信でエラーが起きました。"
+
+# [FAVORABILITY_STAGES] がない場合に使う好感度の段階 (閾値の昇順)。最も低い段階は -451 以下すべてを表す
+_DEFAULT_FAVORABILITY_STAGES = (
+    (-451, "不俱戴天の敵"),
+    (-450, "宿敵している相手"),
+    (-300, "憎悪している相手"),
+    (-150, "嫌悪している相手"),
+    (-100, "警戒している相手"),
+    (-50, "ちょっと苦手な相手"),
+    (-5, "気まずい相手"),
+    (0, "初めまして"),
+    (5, "知り合い"),
+    (50, "顔なじみ"),
+    (100, "友人"),
+    (150, "信頼する相手"),
+    (300, "親友"),
+    (450, "唯一無二の存在"),
+)
+
 class CharacterController:
     """
     キャラクター1体の全ロジック（設定、UI、AI連携、状態管理など）を統括するクラス。
@@ -49,25 +208,27 @@ class CharacterController:
         # --- キャラクター固有の設定ファイル(character.ini)を読み込み ---
         self.character_dir = os.path.join('characters', directory_name)
         char_config_path = os.path.join(self.character_dir, 'character.ini')
-        self.char_config = ConfigParser()
-        self.char_config.read(char_config_path, encoding='utf-8')
+        # 解析済みの {セクション名: {小文字のキー名: 値}}。このクラス内の読み込みはこちらを使う
+        self.char_data = fast_ini.load(char_config_path)
+        # 他のモジュールに渡すConfigParserは、初めて参照されたときに char_data から生成する
+        self._char_config = None
         
         # _load_or_create_savedata() より前に self.name を定義する
+        info = self.char_data.get('INFO', {})
         try:
-            info_section = 'INFO'
-            self.name = self.char_config.get(info_section, 'CHARACTER_NAME')
-            self.personality = self.char_config.get(info_section, 'CHARACTER_PERSONALITY')
+            self.name = info['character_name']
+            self.personality = info['character_personality']
             
             # 発話頻度を読み込み、0-100の範囲に収める
-            raw_freq = self.char_config.getint(info_section, 'SPEECH_FREQUENCY', fallback=50)
+            raw_freq = int(info.get('speech_frequency', 50))
             self.speech_frequency = max(0, min(100, raw_freq))
             
             # キャラクター個別のウィンドウ透過色・縁色を読み込む
-            self.transparent_color = self.char_config.get(info_section, 'TRANSPARENT_COLOR', fallback=mascot_app.default_transparent_color)
-            self.edge_color = self.char_config.get(info_section, 'EDGE_COLOR', fallback=mascot_app.default_edge_color)
-            transparency_mode = self.char_config.get(info_section, 'TRANSPARENCY_MODE', fallback=mascot_app.default_transparency_mode)
+            self.transparent_color = info.get('transparent_color', mascot_app.default_transparent_color)
+            self.edge_color = info.get('edge_color', mascot_app.default_edge_color)
+            transparency_mode = info.get('transparency_mode', mascot_app.default_transparency_mode)
             self.transparency_mode = transparency_mode.lower()
-        except (NoSectionError, NoOptionError, ValueError) as e:
+        except (KeyError, ValueError) as e:
             # character.iniに問題があっても停止しないように、デフォルト値を設定
             print(f"エラー: {char_config_path}の[INFO]セクションまたは必須項目がありません/不正な値です: {e}")
             self.name = f"キャラ{character_id}"
@@ -99,23 +260,26 @@ class CharacterController:
         # 好感度・音量・口調の永続化データを準備
         self.savedata_path = os.path.join(self.savedata_dir, 'savedata.ini')
         self.savedata = ConfigParser()
+        self._savedata_save_job = None # 遅延保存のafter ID
+        self._savedata_save_due = 0.0 # 遅延保存の予定時刻 (time.monotonic基準)
         self.favorability = 0
         self.volume = 50
-        self.volume_var = tk.IntVar(value=self.volume)
+        self._volume_var = None # メニュー用のIntVar (初めて参照されたときに生成)
         # _load_or_create_savedata を呼び出す前に口調変数をNoneで初期化
         self.first_person = None
         self.user_reference = None
         self.third_person_reference = None
         self._load_or_create_savedata() # savedata.iniから永続化データを読み込む
+        self._saved_favorability = self.favorability # 最後にファイルへ書き込んだ好感度
 
         # savedata.iniに設定があればそれを使う (self.first_personなどが既に値を持っている)
         # なければcharacter.iniから読み込む
         if self.first_person is None:
-            self.first_person = self.char_config.get('INFO', 'FIRST_PERSON', fallback='私')
+            self.first_person = info.get('first_person', '私')
         if self.user_reference is None:
-            self.user_reference = self.char_config.get('INFO', 'USER_REFERENCE', fallback='あなた')
+            self.user_reference = info.get('user_reference', 'あなた')
         if self.third_person_reference is None:
-            self.third_person_reference = self.char_config.get('INFO', 'THIRD_PERSON_REFERENCE', fallback='彼/彼女')
+            self.third_person_reference = info.get('third_person_reference', '彼/彼女')
         
         # --- 好感度関連の初期化 ---
         self._load_favorability_stages()
@@ -129,39 +293,20 @@ class CharacterController:
         # --- システムメッセージを読み込み (値が空の場合のフォールバック処理を強化) ---
         msg_section = 'SYSTEM_MESSAGES'
 
-        # デフォルトのメッセージを定義
-        default_msg_empty = "うーん、うまく言葉が出てきません。質問の内容がAIのルールに触れてしまったのかもしれません。表現を少し変えて、もう一度試していただけますか？"
-        default_msg_timeout = "考えるのに時間がかかりすぎているみたいです…。ネットワークやAPIキーの設定を確認してみてください。"
-        default_msg_all_failed = "すべてのAIモデルが今、使えないみたいです。少し待ってからもう一度試してみてください。"
-        default_msg_specific_failed = "モデル'{model_key}'との通信でエラーが起きました。"
-
-        try:
-            # 設定ファイルから値を取得
-            msg_empty = self.char_config.get(msg_section, 'ON_EMPTY_RESPONSE', fallback=default_msg_empty)
-            msg_timeout = self.char_config.get(msg_section, 'ON_API_TIMEOUT', fallback=default_msg_timeout)
-            msg_all_failed = self.char_config.get(msg_section, 'ON_ALL_MODELS_FAILED', fallback=default_msg_all_failed)
-            msg_specific_failed = self.char_config.get(msg_section, 'ON_SPECIFIC_MODEL_FAILED', fallback=default_msg_specific_failed)
-
-            # 読み込んだ値が空文字列でないかチェックし、空ならデフォルト値を設定
-            self.msg_on_empty_response = msg_empty if msg_empty else default_msg_empty
-            self.msg_on_api_timeout = msg_timeout if msg_timeout else default_msg_timeout
-            self.msg_on_all_models_failed = msg_all_failed if msg_all_failed else default_msg_all_failed
-            self.msg_on_specific_model_failed = msg_specific_failed if msg_specific_failed else default_msg_specific_failed
-
-        except (NoSectionError, NoOptionError):
-            # [SYSTEM_MESSAGES]セクション自体がない場合は、すべてデフォルト値を使う
-            self.msg_on_empty_response = default_msg_empty
-            self.msg_on_api_timeout = default_msg_timeout
-            self.msg_on_all_models_failed = default_msg_all_failed
-            self.msg_on_specific_model_failed = default_msg_specific_failed
+        # 設定ファイルから値を取得し、セクションや項目がない場合、値が空の場合はデフォルト値 (_DEFAULT_MSG_*) を使う
+        messages = self.char_data.get(msg_section, {})
+        self.msg_on_empty_response = messages.get('on_empty_response') or _DEFAULT_MSG_EMPTY
+        self.msg_on_api_timeout = messages.get('on_api_timeout') or _DEFAULT_MSG_TIMEOUT
+        self.msg_on_all_models_failed = messages.get('on_all_models_failed') or _DEFAULT_MSG_ALL_FAILED
+        self.msg_on_specific_model_failed = messages.get('on_specific_model_failed') or _DEFAULT_MSG_SPECIFIC_FAILED
 
         # --- 衣装・感情・音声関連の初期化 ---
         self.costumes = {}
         self.current_costume_id = 'default'
-        self.costume_var = tk.StringVar(value=self.current_costume_id)
+        self._costume_var = None # メニュー用のStringVar (初めて参照されたときに生成)
         # 現在の衣装で利用可能な感情のマップ {'en': 'jp'}
         self.available_emotions = {}
-        # 感情(日本語名)と音声パラメータのマッピング
+        # 感情(日本語名)と音声パラメータのマッピング (値は初回の発話時に評価する)
         self.voice_params = {}
 
         self._load_costume_config()
@@ -172,13 +317,9 @@ class CharacterController:
 
         # --- UIとAPIハンドラの生成 ---
         self.ui = CharacterUIGroup(self, self.config, self.char_config, self.input_history_manager)
-        self.gemma_api = GemmaAPI( # 感情分析用のAPIハンドラ
-            config,
-            gemma_api_key=self.mascot_app.gemma_api_key,
-            gemma_model_name=self.mascot_app.gemma_model_name,
-            gemma_test_mode=self.mascot_app.gemma_test_mode,
-            mascot=self
-        )
+        # 感情分析用のAPIハンドラは、初めて使われるときに生成する (gemma_api プロパティを参照)
+        self._gemma_settings = (self.mascot_app.gemma_api_key, self.mascot_app.gemma_model_name, self.mascot_app.gemma_test_mode)
+        self._gemma_api = None
         self.system_instruction = ""
         
         self.event_runner = None # イベント実行用のインスタンス
@@ -188,115 +329,144 @@ class CharacterController:
         # 起動時に名前とハートの表示を更新する
         self.ui.update_info_display()
 
+    @property
+    def char_config(self) -> ConfigParser:
+        """
+        character.iniの内容を持つConfigParser。VoiceManagerなど他のモジュール向けに、
+        初めて参照されたときにファイルを読み直さず char_data から生成します。
+        char_data の値は '%%' を '%' に戻し済みのため、値の補間は行いません。
+        """
+        if self._char_config is None:
+            self._char_config = ConfigParser(interpolation=None)
+            self._char_config.read_dict(self.char_data)
+        return self._char_config
+
+    @property
+    def volume_var(self) -> tk.IntVar:
+        """音量メニューのラジオボタン用の変数。メニューを初めて開いたときに現在の音量で生成します。"""
+        if self._volume_var is None:
+            self._volume_var = tk.IntVar(value=self.volume)
+        return self._volume_var
+
+    @property
+    def costume_var(self) -> tk.StringVar:
+        """衣装メニューのラジオボタン用の変数。メニューを初めて開いたときに現在の衣装IDで生成します。"""
+        if self._costume_var is None:
+            self._costume_var = tk.StringVar(value=self.current_costume_id)
+        return self._costume_var
+
+    @property
+    def gemma_api(self) -> GemmaAPI:
+        """感情分析用のAPIハンドラ。起動時には生成せず、初めて参照されたときに現在の設定で生成します。"""
+        if self._gemma_api is None:
+            gemma_api_key, gemma_model_name, gemma_test_mode = self._gemma_settings
+            self._gemma_api = GemmaAPI(
+                self.config,
+                gemma_api_key=gemma_api_key,
+                gemma_model_name=gemma_model_name,
+                gemma_test_mode=gemma_test_mode,
+                mascot=self
+            )
+        return self._gemma_api
+
     def _load_voice_params(self):
-        """character.iniから音声パラメータを読み込み、self.voice_paramsに格納します。"""
-        if not self.char_config.has_section('VOICE_PARAMS'):
+        """
+        character.iniから音声パラメータを読み込み、self.voice_paramsに格納します。
+        値の評価は行わず、実際に使われたときに _LazyVoiceParams が評価します。
+        """
+        voice_section = self.char_data.get('VOICE_PARAMS')
+        if voice_section is None:
             print(f"[{self.name}] 情報: character.ini に [VOICE_PARAMS] セクションがありません。")
+            self.voice_params = {}
             return
 
         # デフォルト衣装の感情マップを使って、英語キーを日本語キーに変換します。
         default_emotions = self.costumes.get('default', {}).get('emotions', {'normal': 'normal'})
         
-        for emotion_en, params_str in self.char_config.items('VOICE_PARAMS'):
-            try:
-                # 英語キーを日本語キーに変換
-                emotion_jp = emotion_en
-                # VOICE_PARAMS のキーは英語(emotion_en)で統一されているが、値として渡ってくる
-                # 感情名は日本語(emotion_jp)の場合があるため、両方に対応できるようにする
-                # VOICE_PARAMSのキーは英語のまま使用し、適用時に日本語から英語へ逆引きする方が堅牢かもしれない
-                # が、現在の実装ではvoice_paramsのキーを日本語名に変換して格納する
-                for en, jp in default_emotions.items():
-                    if en == emotion_en:
-                        emotion_jp = jp
-                        break
-                
-                params_dict = ast.literal_eval(params_str)
-                self.voice_params[emotion_jp] = params_dict
-            except (ValueError, SyntaxError) as e:
-                print(f"[{self.name}] 警告: [VOICE_PARAMS] の '{emotion_en}' の書式が不正です: {e}")
+        raw_params = {}
+        for emotion_en, params_str in voice_section.items():
+            # 英語キーを日本語キーに変換 (対応がなければ英語キーのまま)
+            # VOICE_PARAMS のキーは英語(emotion_en)で統一されているが、値として渡ってくる
+            # 感情名は日本語(emotion_jp)の場合があるため、両方に対応できるようにする
+            # VOICE_PARAMSのキーは英語のまま使用し、適用時に日本語から英語へ逆引きする方が堅牢かもしれない
+            # が、現在の実装ではvoice_paramsのキーを日本語名に変換して格納する
+            emotion_jp = default_emotions.get(emotion_en, emotion_en)
+            raw_params[emotion_jp] = (emotion_en, params_str)
+        self.voice_params = _LazyVoiceParams(raw_params, self.name)
 
         print(f"[{self.name}] 音声パラメータを読み込みました: {list(self.voice_params.keys())}")
 
     def _parse_emotions(self, emotion_string):
         """'en1:jp1, en2:jp2' 形式の文字列を {'en1':'jp1', 'en2':'jp2'} の辞書に変換します。"""
-        emotions = {}
-        try:
-            for pair in emotion_string.split(','):
-                if ':' in pair:
-                    key, value = pair.split(':', 1)
-                    emotions[key.strip()] = value.strip()
-        except Exception as e:
-            print(f"警告: AVAILABLE_EMOTIONS の解析に失敗しました。文字列: '{emotion_string}', エラー: {e}")
-        
+        emotions = dict(_parse_emotions_cached(emotion_string))
+
         # 'normal' が定義されていない場合は、安全のために追加します。
         if 'normal' not in emotions:
             emotions['normal'] = 'normal'
         return emotions
 
+    def _make_default_costume(self):
+        """[COSTUME_DETAIL_default] の内容 (なければ既定値) から、デフォルト衣装の情報を作成します。"""
+        default_detail = self.char_data.get('COSTUME_DETAIL_default', {})
+        return {
+            'name': 'デフォルト',
+            'image_path': os.path.join(self.character_dir, default_detail.get('image_path', '.')),
+            'config_section': 'COSTUME_DETAIL_default',
+            'emotions': self._parse_emotions(default_detail.get('available_emotions', ''))
+        }
+
     def _load_costume_config(self):
         """character.iniを解析し、このキャラクターが利用可能な衣装の情報を読み込んでself.costumesに格納します。"""
-        if not self.char_config.has_section('COSTUMES'):
+        sections = self.char_data
+        if 'COSTUMES' not in sections:
             print(f"[{self.name}] 警告: character.ini に [COSTUMES] セクションがありません。デフォルト衣装のみ使用します。")
-            emotions = self._parse_emotions(self.char_config.get('COSTUME_DETAIL_default', 'available_emotions', fallback=''))
-            image_path_str = self.char_config.get('COSTUME_DETAIL_default', 'image_path', fallback='.')
-            self.costumes['default'] = {
-                'name': 'デフォルト',
-                'image_path': os.path.join(self.character_dir, image_path_str),
-                'config_section': 'COSTUME_DETAIL_default',
-                'emotions': emotions
-            }
+            self.costumes['default'] = self._make_default_costume()
             return
             
-        # 1. 最初に、ファイル内に存在する全てのセクション名をリストとして取得しておく
-        all_available_sections = self.char_config.sections()
+        # 1. 最初に、ファイル内のセクション名を {小文字の名前: ファイルに書かれている表記} で引けるようにしておく
+        #    (同じ名前が複数ある場合は、ConfigParserと同様に先に現れたものを使う)
+        sections_by_lower = {}
+        for section in sections:
+            sections_by_lower.setdefault(section.lower(), section)
 
-        for costume_id, costume_name in self.char_config.items('COSTUMES'):
+        for costume_id, costume_name in sections['COSTUMES'].items():
             # 2. 探したいセクション名の "基本形" を、比較のために小文字で作成する
-            #    configparserはキーを小文字にするため、costume_idは既に小文字になっている
+            #    キー名は小文字に変換されるため、costume_idは既に小文字になっている
             section_to_find_lower = f'costume_detail_{costume_id}'.lower()
 
-            # 3. 存在する全セクションをループし、小文字に変換して一致するものを探す
-            found_section_name = None
-            for section in all_available_sections:
-                if section.lower() == section_to_find_lower:
-                    # 一致するものが見つかったら、ファイルに書かれている「正しい表記」のセクション名を保持
-                    found_section_name = section
-                    break # 発見したのでループを抜ける
+            # 3. ファイルに書かれている「正しい表記」のセクション名を取得する
+            found_section_name = sections_by_lower.get(section_to_find_lower)
             
             # 4. 発見したセクション名を使って、後続の処理を行う
             if found_section_name:
-                try:
-                    relative_image_path = self.char_config.get(found_section_name, 'image_path')
-                    full_image_path = os.path.join(self.character_dir, relative_image_path)
-                    
-                    emotions_str = self.char_config.get(found_section_name, 'available_emotions', fallback='normal:normal')
-                    emotions_map = self._parse_emotions(emotions_str)
-
-                    self.costumes[costume_id] = {
-                        'name': costume_name,
-                        'image_path': full_image_path,
-                        'config_section': found_section_name, # 正しいセクション名を保存
-                        'emotions': emotions_map
-                    }
-                except (NoOptionError) as e:
-                    print(f"[{self.name}] 警告: 衣装セクション [{found_section_name}] の情報が不足しています: {e}")
+                detail = sections[found_section_name]
+                relative_image_path = detail.get('image_path')
+                if relative_image_path is None:
+                    print(f"[{self.name}] 警告: 衣装セクション [{found_section_name}] の情報が不足しています: image_path がありません。")
+                    continue
+                full_image_path = os.path.join(self.character_dir, relative_image_path)
+
+                emotions_str = detail.get('available_emotions', 'normal:normal')
+                emotions_map = self._parse_emotions(emotions_str)
+
+                self.costumes[costume_id] = {
+                    'name': costume_name,
+                    'image_path': full_image_path,
+                    'config_section': found_section_name, # 正しいセクション名を保存
+                    'emotions': emotions_map
+                }
             else:
                 # 5. 最後まで見つからなかった場合は警告を出す
                 print(f"[{self.name}] 警告: 衣装定義セクション [COSTUME_DETAIL_{costume_id}] が見つかりません。")
 
         if 'default' not in self.costumes:
-             emotions = self._parse_emotions(self.char_config.get('COSTUME_DETAIL_default', 'available_emotions', fallback=''))
-             image_path_str = self.char_config.get('COSTUME_DETAIL_default', 'image_path', fallback='.')
-             self.costumes['default'] = {
-                'name': 'デフォルト',
-                'image_path': os.path.join(self.character_dir, image_path_str),
-                'config_section': 'COSTUME_DETAIL_default',
-                'emotions': emotions
-            }
+            self.costumes['default'] = self._make_default_costume()
         print(f"[{self.name}] 読み込まれた衣装: {[info['name'] for info in self.costumes.values()]}")
 
     def destroy(self):
         """このキャラクターに関連するUIリソースを破棄します。"""
+        # 保存待ちの変更があれば、破棄する前に書き出しておく
+        self.flush_savedata()
         if self.ui:
             self.ui.destroy()
         print(f"[{self.name}] のUIリソースが破棄されました。")
@@ -372,49 +542,59 @@ class CharacterController:
         """
         self.ui.move_to_side(side)
 
-    def change_costume(self, costume_id, triggered_by_user=False, is_initial_setup=False, generate_comment=True):
+    def change_costume(self, costume_id, triggered_by_user=False, is_initial_setup=False, generate_comment=True, force_reload=False):
         """
         キャラクターの衣装を変更し、関連アセット（画像、タッチエリア、感情定義）を再読み込みします。
+        現在と同じ衣装が指定された場合は、アセットの再読み込みを省略します。
 
         Args:
             costume_id (str): 変更先の衣装ID。
             triggered_by_user (bool): ユーザー操作による変更か、AIによる自律的な変更かを区別するフラグ。
             is_initial_setup (bool): 起動時の初期設定呼び出しかどうか。
             generate_comment (bool): 変更後にAIにコメントを生成させるかどうか。
+            force_reload (bool): 同じ衣装でもアセットを再読み込みするかどうか (設定の再読み込み時など)。
         """
         if costume_id not in self.costumes:
             print(f"警告: 存在しない衣装IDが指定されました: {costume_id}")
             return
         
-        if triggered_by_user and (not self.mascot_app.is_ready or self.mascot_app.is_processing_lock.locked()):
+        # ユーザー操作の場合は、空いていればその場でロックを取得し、処理中なら断る
+        if triggered_by_user and (not self.mascot_app.is_ready or not self.mascot_app.is_processing_lock.acquire(blocking=False)):
             self.ui.output_box.set_text("今、他のことを考えてるみたい...")
             return
 
-        # ユーザー操作 or AIの自律的な変更の場合のみロックを取得
+        # ユーザー操作 or AIの自律的な変更の場合のみロックを取得 (ユーザー操作の場合は取得済み)
         should_lock = triggered_by_user or (not is_initial_setup and generate_comment)
-        if should_lock:
+        if should_lock and not triggered_by_user:
             self.mascot_app.is_processing_lock.acquire()
 
+        # 同じ衣装への変更では、画像の読み込みやウィンドウの再配置といった重い処理を省略する
+        needs_reload = force_reload or is_initial_setup or costume_id != self.current_costume_id
+
         try:
-            print(f"[{self.name}] が衣装を '{self.costumes[costume_id]['name']}' に変更します。")
-            self.current_costume_id = costume_id
-            self.costume_var.set(costume_id)
             costume_info = self.costumes[costume_id]
-            
-            self.available_emotions = costume_info.get('emotions', {'normal': 'normal'})
-            
-            self.ui.emotion_handler.load_images_and_touch_areas(
-                costume_info['image_path'],
-                self.available_emotions,
-                self.char_config, 
-                costume_info['config_section']
-            )
-            
-            normal_emotion_jp = self.available_emotions.get('normal', 'normal')
-            self.ui.emotion_handler.update_image(normal_emotion_jp)
+            if needs_reload:
+                print(f"[{self.name}] が衣装を '{costume_info['name']}' に変更します。")
+                self.current_costume_id = costume_id
+                if self._costume_var is not None:
+                    self._costume_var.set(costume_id)
+                
+                self.available_emotions = costume_info.get('emotions', {'normal': 'normal'})
+                
+                self.ui.emotion_handler.load_images_and_touch_areas(
+                    costume_info['image_path'],
+                    self.available_emotions,
+                    self.char_config, 
+                    costume_info['config_section']
+                )
+                
+                normal_emotion_jp = self.available_emotions.get('normal', 'normal')
+                self.ui.emotion_handler.update_image(normal_emotion_jp)
 
-            if not is_initial_setup:
-                self.ui.update_geometry()
+                if not is_initial_setup:
+                    self.ui.update_geometry()
+            else:
+                print(f"[{self.name}] は既に衣装 '{costume_info['name']}' を着ているため、再読み込みを省略します。")
 
         except Exception as e:
             print(f"衣装変更中のアセット読み込み等でエラーが発生しました: {e}")
@@ -471,17 +651,21 @@ class CharacterController:
         ユーザーからのテキスト入力を処理し、AIに応答生成を要求します。
         """
         mascot = self.mascot_app
-        if not mascot.is_ready or mascot.is_processing_lock.locked() or mascot.is_in_rally or mascot.is_event_running:
+        # ロックは他の条件を満たしたときだけ取得を試み、取得できなければ処理中とみなす
+        if (not mascot.is_ready or mascot.is_in_rally or mascot.is_event_running
+                or not mascot.is_processing_lock.acquire(blocking=False)):
             self.ui.output_box.set_text("まだ準備中か、AIが考え中か、二人がお話中だよ。")
             return
         
-        with mascot.is_processing_lock:
+        try:
             mascot.current_rally_count = 0
             mascot._log_event_for_all_characters(
                 actor_id='USER', target_id=self.character_id, action_type='INPUT', content=user_input
             )
             self.ui.output_box.set_text("（考え中...）")
             mascot.request_speech(self, user_input, "応答")
+        finally:
+            mascot.is_processing_lock.release()
 
     def handle_touch_action(self, action_name):
         """
@@ -490,11 +674,11 @@ class CharacterController:
         mascot = self.mascot_app
         if mascot.is_event_running:
             return
-        if not mascot.is_ready or mascot.is_processing_lock.locked() or mascot.is_in_rally:
+        if not mascot.is_ready or mascot.is_in_rally or not mascot.is_processing_lock.acquire(blocking=False):
             self.ui.output_box.set_text("今、他のことを考えてるみたい...")
             return
 
-        with mascot.is_processing_lock:
+        try:
             mascot.current_rally_count = 0 
             mascot._log_event_for_all_characters(
                 actor_id='USER', target_id=self.character_id, action_type='TOUCH', content=action_name
@@ -504,6 +688,8 @@ class CharacterController:
             prompt = (f"ユーザーがあなたにアクション「{action_name}」をしました。"
                       f"このアクションに対して、あなたのキャラクターとして自然な反応を短いセリフで返してください。")
             mascot.request_speech(self, prompt, "タッチ反応")
+        finally:
+            mascot.is_processing_lock.release()
 
     def _load_or_create_savedata(self):
         """
@@ -511,7 +697,8 @@ class CharacterController:
         ファイルが存在しない場合は、初期値で新規作成する。
         [Persona]セクションも読み込むように変更。
         """
-        if not os.path.exists(self.savedata_path):
+        is_new_file = not os.path.exists(self.savedata_path)
+        if is_new_file:
             self.savedata['STATUS'] = {'FAVORABILITY': '0', 'VOLUME': '50'}
             # [Persona] セクションは最初は空で作成
             self.savedata['Persona'] = {}
@@ -523,14 +710,21 @@ class CharacterController:
                 print(f"[{self.name}] savedata.ini の新規作成に失敗: {e}")
         
         try:
-            self.savedata.read(self.savedata_path, encoding='utf-8')
+            # 新規作成した場合は、書き込んだ内容がそのままメモリ上にあるので読み直さない
+            if not is_new_file:
+                # 読み込みは軽量なfast_iniで行い、書き込み用にConfigParserへ流し込む
+                # (頻繁に書き換わるファイルなので、更新時刻とサイズで判定するload()のキャッシュは通さない。
+                #  '%%' のエスケープはConfigParserに任せるため raw=True で読む)
+                with open(self.savedata_path, 'r', encoding='utf-8') as f:
+                    self.savedata.read_dict(fast_ini.parse(f.read(), raw=True))
             # [STATUS]セクションが存在しない場合は作成
             if not self.savedata.has_section('STATUS'):
                 self.savedata.add_section('STATUS')
                 
             self.favorability = self.savedata.getint('STATUS', 'FAVORABILITY', fallback=0)
             self.volume = self.savedata.getint('STATUS', 'VOLUME', fallback=50)
-            self.volume_var.set(self.volume)
+            if self._volume_var is not None:
+                self._volume_var.set(self.volume)
 
             # [Persona]セクションを読み込む
             if self.savedata.has_section('Persona'):
@@ -546,11 +740,10 @@ class CharacterController:
             if not self.savedata.has_section('STATUS'): self.savedata.add_section('STATUS')
             self.savedata.set('STATUS', 'FAVORABILITY', '0')
             self.savedata.set('STATUS', 'VOLUME', '50')
-            with open(self.savedata_path, 'w', encoding='utf-8') as f:
-                self.savedata.write(f)
+            self._write_savedata()
     
     def _save_persona(self):
-        """現在の口調設定をsavedata.iniの[Persona]セクションに保存する。"""
+        """現在の口調設定をsavedata.iniの[Persona]セクションに反映し、保存を予約する。"""
         if not self.savedata.has_section('Persona'):
             self.savedata.add_section('Persona')
 
@@ -562,32 +755,64 @@ class CharacterController:
         if self.third_person_reference is not None:
             self.savedata.set('Persona', 'THIRD_PERSON_REFERENCE', self.third_person_reference)
 
+        self._schedule_savedata_save()
+        print(f"[{self.name}] 口調設定の保存を予約しました。")
+
+    def _schedule_savedata_save(self, delay_ms=1000):
+        """
+        savedata.iniの保存を delay_ms 後に予約する。既により早い保存が予約されていればそれに任せ、
+        短い間の複数の変更は一度の書き込みにまとめる。
+        """
+        due = time.monotonic() + delay_ms / 1000
+        root = self.mascot_app.root
+        if self._savedata_save_job:
+            if self._savedata_save_due <= due:
+                return
+            root.after_cancel(self._savedata_save_job)
+        self._savedata_save_due = due
+        self._savedata_save_job = root.after(delay_ms, self._write_savedata)
+
+    def flush_savedata(self):
+        """予約済みの保存があれば、待たずに今すぐ書き込む。終了時やキャラクターの退去時に呼ぶ。"""
+        if self._savedata_save_job:
+            self._write_savedata()
+
+    def _write_savedata(self) -> bool:
+        """
+        savedata.iniを今すぐ書き込む。予約済みの保存はキャンセルする。
+        書き込み中に終了しても壊れたファイルが残らないよう、一時ファイルに書いてから置き換える。
+        """
+        if self._savedata_save_job:
+            self.mascot_app.root.after_cancel(self._savedata_save_job)
+            self._savedata_save_job = None
+
+        tmp_path = self.savedata_path + '.tmp'
         try:
-            with open(self.savedata_path, 'w', encoding='utf-8') as f:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 self.savedata.write(f)
-            print(f"[{self.name}] 口調設定を savedata.ini に保存しました。")
+            os.replace(tmp_path, self.savedata_path)
+            self._saved_favorability = self.favorability
+            return True
         except Exception as e:
             print(f"[{self.name}] savedata.iniの保存に失敗しました: {e}")
+            return False
 
     def update_volume(self, new_volume: int):
         """
-        音量を更新し、ファイルに保存する。
+        音量を更新し、ファイルへの保存を予約する。
         """
         new_volume = max(0, min(100, new_volume)) # 0-100の範囲に丸める
         if self.volume != new_volume:
             self.volume = new_volume
-            self.volume_var.set(new_volume) # UI変数を更新
+            if self._volume_var is not None:
+                self._volume_var.set(new_volume) # UI変数を更新
             self.savedata.set('STATUS', 'VOLUME', str(new_volume))
-            try:
-                with open(self.savedata_path, 'w', encoding='utf-8') as f:
-                    self.savedata.write(f)
-                print(f"[{self.name}] 音量が {new_volume}% に変更されました。")
-            except Exception as e:
-                print(f"[{self.name}] savedata.iniの保存に失敗しました: {e}")
+            self._schedule_savedata_save()
+            print(f"[{self.name}] 音量が {new_volume}% に変更されました。")
 
     def update_favorability(self, change_value: int, apply_limit: bool = True):
         """
-        好感度を更新し、ファイルに保存する。
+        好感度を更新し、ファイルへの保存を予約する。
         apply_limitがTrueの場合のみ、変化量に上限/下限が設定される。
         """
         # apply_limit が True の場合のみ、AIが指定した変化量を-25から25の範囲に丸める
@@ -601,26 +826,27 @@ class CharacterController:
             actual_change = new_favorability - self.favorability
             self.favorability = new_favorability
             self.savedata.set('STATUS', 'FAVORABILITY', str(new_favorability))
-            try:
-                with open(self.savedata_path, 'w', encoding='utf-8') as f:
-                    self.savedata.write(f)
-                print(f"[{self.name}] 好感度が {actual_change} 変化し、{new_favorability} になりました。")
-                self.ui.update_info_display()
-            except Exception as e:
-                print(f"[{self.name}] savedata.iniの保存に失敗しました: {e}")
+            # 保存済みの値から大きく(5以上)変わったらすぐに、小さな変化は30秒以内にまとめて保存する
+            # (メモリ上の値が正であり、終了時や退去時には flush_savedata で必ず書き出される)
+            if abs(new_favorability - self._saved_favorability) >= 5:
+                self._schedule_savedata_save()
+            else:
+                self._schedule_savedata_save(delay_ms=30000)
+            print(f"[{self.name}] 好感度が {actual_change} 変化し、{new_favorability} になりました。")
+            self.ui.update_info_display()
 
     def _load_heart_ui_config(self):
         """character.iniからハート専用のUI設定 ([HEART_UI]) を読み込む。"""
-        section_name = 'HEART_UI'
-        if not self.char_config.has_section(section_name):
+        heart_ui = self.char_data.get('HEART_UI')
+        if heart_ui is None:
             self.heart_transparency_mode = 'color_key' # セクションがない場合はデフォルト
             return # セクションがなければ何もしない
 
-        self.heart_transparent_color = self.char_config.get(section_name, 'TRANSPARENT_COLOR', fallback=None)
-        self.heart_edge_color = self.char_config.get(section_name, 'EDGE_COLOR', fallback=None)
+        self.heart_transparent_color = heart_ui.get('transparent_color')
+        self.heart_edge_color = heart_ui.get('edge_color')
 
         # 新しく TRANSPARENCY_MODE を読み込む
-        mode = self.char_config.get(section_name, 'TRANSPARENCY_MODE', fallback='color_key').lower()
+        mode = heart_ui.get('transparency_mode', 'color_key').lower()
         if mode not in ('color_key', 'alpha'):
             mode = 'color_key'
 
@@ -632,11 +858,12 @@ class CharacterController:
     def _load_favorability_hearts(self):
         """character.iniから好感度ハートマークの設定 ([FAVORABILITY_HEARTS]) を読み込む。"""
         section_name = 'FAVORABILITY_HEARTS'
-        if not self.char_config.has_section(section_name):
+        section = self.char_data.get(section_name)
+        if section is None:
             return
 
         hearts = []
-        for key, value in self.char_config.items(section_name):
+        for key, value in section.items():
             try:
                 threshold = int(key)
                 image_filename = value.strip()
@@ -649,6 +876,9 @@ class CharacterController:
         # 閾値の降順（大きいものから順）でソート
         hearts.sort(key=lambda x: x[0], reverse=True)
         self.favorability_hearts = hearts
+        # 二分探索用に、閾値の昇順で閾値とファイル名を別々のリストにしておく
+        self._heart_thresholds = [threshold for threshold, _ in reversed(hearts)]
+        self._heart_filenames = [filename for _, filename in reversed(hearts)]
         print(f"[{self.name}] 好感度ハート設定を読み込みました: {self.favorability_hearts}")
 
     def get_current_heart_image_filename(self) -> str | None:
@@ -656,60 +886,52 @@ class CharacterController:
         if not self.favorability_hearts:
             return None
             
-        fav = self.favorability
-        for threshold, filename in self.favorability_hearts:
-            if fav >= threshold:
-                return filename
-        
+        # 好感度以下で最大の閾値を探す
+        idx = bisect.bisect_right(self._heart_thresholds, self.favorability) - 1
         # どの閾値にも満たない場合（非常に好感度が低いなど）は何も表示しない
-        return None
+        return self._heart_filenames[idx] if idx >= 0 else None
 
     def get_user_recognition_status(self) -> str:
         """
         現在の好感度に基づいて、AIに渡す「ユーザーへの認識」ステータスを返す。
         character.iniに設定があればそれを優先し、なければデフォルト値を使用する。
+        好感度が前回の呼び出しから変わっていなければ、前回の結果をそのまま返す。
         """
         fav = self.favorability
+        cached = self._recognition_cache
+        if cached is not None and cached[0] == fav:
+            return cached[1]
 
-        # [FAVORABILITY_STAGES] のカスタム設定が読み込まれている場合
-        if self.favorability_stages:
-            # 閾値の大きい順にチェック
-            for threshold, name in self.favorability_stages:
-                if fav >= threshold:
-                    return name
-            # どの閾値にも当てはまらなかった場合（好感度が最低閾値より低い場合）、
-            # 最も低い設定の名称を返す
-            return self.favorability_stages[-1][1]
-
-        # カスタム設定がない、または読み込みに失敗した場合 (フォールバック)
-        else:
-            if fav >= 450: return "唯一無二の存在"
-            elif fav >= 300: return "親友"
-            elif fav >= 150: return "信頼する相手"
-            elif fav >= 100: return "友人"
-            elif fav >= 50: return "顔なじみ"
-            elif fav >= 5: return "知り合い"
-            elif fav >= 0: return "初めまして"
-            elif fav >= -5: return "気まずい相手"
-            elif fav >= -50: return "ちょっと苦手な相手"
-            elif fav >= -100: return "警戒している相手"
-            elif fav >= -150: return "嫌悪している相手"
-            elif fav >= -300: return "憎悪している相手"
-            elif fav >= -450: return "宿敵している相手"
-            else: return "不俱戴天の敵"
+        status = self._compute_user_recognition_status(fav)
+        self._recognition_cache = (fav, status)
+        return status
+
+    def _compute_user_recognition_status(self, fav: int) -> str:
+        """
+        指定された好感度に対応する「ユーザーへの認識」ステータスを求める。
+        段階は閾値の昇順に並べてあり、好感度以下で最大の閾値を二分探索で探す。
+        """
+        idx = bisect.bisect_right(self._stage_thresholds, fav) - 1
+        # どの閾値にも当てはまらなかった場合（好感度が最低閾値より低い場合）、
+        # 最も低い段階の名称を返す
+        return self._stage_names[max(idx, 0)]
 
     def _load_favorability_stages(self):
         """character.iniから好感度の段階設定 ([FAVORABILITY_STAGES]) を読み込む。"""
         self.favorability_stages = [] # 失敗時に備えて、まず空リストで初期化
+        self._recognition_cache = None # (好感度, ステータス)。段階設定が変わるので破棄する
+        # カスタム設定がない、または読み込みに失敗した場合はデフォルトの段階を使う
+        self._set_stage_lookup(_DEFAULT_FAVORABILITY_STAGES)
         section_name = 'FAVORABILITY_STAGES'
         
-        if not self.char_config.has_section(section_name):
+        section = self.char_data.get(section_name)
+        if section is None:
             # セクションがない場合は、デフォルト値を使うことをユーザーに通知して終了
             print(f"[{self.name}] 情報: character.ini に [{section_name}] がないため、デフォルトの関係性を使用します。")
             return
 
         stages = []
-        for key, value in self.char_config.items(section_name):
+        for key, value in section.items():
             try:
                 # キー（閾値）を整数に、値（名称）を文字列に変換
                 threshold = int(key)
@@ -732,8 +954,15 @@ class CharacterController:
         # 読み込んだ設定を、閾値の降順（大きいものから順）でソートする
         stages.sort(key=lambda x: x[0], reverse=True)
         self.favorability_stages = stages
+        self._set_stage_lookup(reversed(stages))
         print(f"[{self.name}] 好感度の段階設定を読み込みました: {self.favorability_stages}")
 
+    def _set_stage_lookup(self, stages_asc):
+        """閾値の昇順に並んだ (閾値, 名称) の組から、二分探索用の閾値と名称のリストを作る。"""
+        stages_asc = list(stages_asc)
+        self._stage_thresholds = [threshold for threshold, _ in stages_asc]
+        self._stage_names = [name for _, name in stages_asc]
+
     def set_partner(self, partner_controller):
         """
         相方のキャラクターコントローラーを設定し、AIへの基本指示（システムプロンプト）を構築します。
@@ -747,70 +976,23 @@ class CharacterController:
             partner_reference_name = partner_reference_name.replace("(キャラクター名)", self.partner.name)
 
         if self.partner:
-            partner_info = f"隣には相方の「{self.partner.name}」がいます。彼/彼女もAIで、あなたと会話をすることがあります。\n"
-            pass_turn_rule = "3. `pass_turn_to_partner`: これは任意です。会話のターンを相方に渡す場合のみ呼び出します。\n"
-            extra_rules = (
-                "## 相方との会話（ラリー）について\n"
-                "状況説明が「相方からの返答要求」の場合、相方のセリフがテキストとして渡されます。あなたはそれに対して返答を生成します。\n"
-                "- 会話をさらに続けたい場合は `pass_turn_to_partner(continue_rally=True)` を呼び出してください。\n"
-                "- 会話をここで区切るのが自然だと判断した場合は `pass_turn_to_partner(continue_rally=False)` を呼び出してください。\n"
-                "- ラリーは最大でも2～3回の往復で完結するように心がけてください。\n"
-            )
+            partner_info = _PARTNER_INFO_TEMPLATE.format(partner_name=self.partner.name)
+            pass_turn_rule = _PASS_TURN_RULE
+            extra_rules = _RALLY_RULES
         else:
-            partner_info = "あなた一人で動作しています。相方はいません。\n"
+            partner_info = _SOLO_INFO
             pass_turn_rule = ""
-            extra_rules = "**重要**: 相方がいないため、`pass_turn_to_partner`関数は決して呼び出さないでください。\n"
-
-        self.system_instruction = (
-            f"あなたはAIデスクトップマスコット「{self.name}」です。"
-            f"{self.personality}"
-            "ユーザーの感情や会話の流れを汲み取り、人間らしい自然な応答を生成することがあなたの役割です。常駐型マスコットなので、発言は簡潔にまとめてください。\n"
-            f"{partner_info}"
-            "ユーザーからの入力やシステムからの指示は、明確に区別されて渡されます。\n"
-            "\n"
-            "## 口調のルール\n"
-            "以下の口調を厳密に守ってロールプレイをしてください。\n"
-            f"- あなたの一人称: 「{self.first_person}」\n"
-            f"- ユーザーの呼び方: 「{self.user_reference}」\n"
-            f"- 相方や第三者の呼び方: 「{partner_reference_name}」\n"
-            "\n"
-            "## 記憶について\n"
-            "あなたには短期記憶と長期記憶があります。これらを総合的に判断して応答してください。\n"
-            "- 短期記憶: 直近の会話のログです。会話の流れを把握するために使います。\n"
-            "- 長期記憶: ユーザーとの関係構築に重要な、要約された出来事のリストです。あなたの人格形成や長期的な応答に影響します。\n"
-            "\n"
-            "### 長期記憶のルール\n"
-            "あなたは会話のキュレーターとして、何を記憶し、何を忘れるべきか判断する責任があります。\n"
-            "**記憶すべきことの例:**\n"
-            "- ユーザーの好み、嫌いなもの（例: 好きな食べ物、好きなアニメ）\n"
-            "- ユーザーの個人的な情報（例: 飼っているペットの名前、誕生日）\n"
-            "- ユーザーが話した重要な出来事や悩み（例: 新しい仕事、プロジェクトの進捗）\n"
-            "- あなたとユーザーの間で交わされた約束\n"
-            "**記憶すべきでないことの例:**\n"
-            "- 単純な挨拶や相槌（「こんにちは」「なるほど」など）\n"
-            "- 一時的ですぐに価値がなくなる情報\n"
-            "- 会話の本筋と関係ない雑談\n"
-            "\n"
-            "### 重要度の採点基準\n"
-            "- **81-100点**: ユーザーのアイデンティティに関わる核となる情報（名前、誕生日）、絶対に忘れてはならない約束など。\n"
-            "- **51-80点**: ユーザーの重要な好み、継続的な関心事、大きな出来事など。\n"
-            "- **21-50点**: 一時的な関心事、会話の重要なポイントなど。\n"
-            "- **1-20点**: 些細だが記録する価値が少しだけある情報。\n"
-            "\n"
-            "## 応答のルール\n"
-            "あなたの応答は、必ず以下の関数を呼び出すことで行います。プレーンテキストでの応答は禁止です。\n"
-            "1. `generate_speech`(必須): 状況に最も適したセリフを生成します。\n"
-            "2. `change_emotion`(必須): 生成したセリフにふさわしい感情を指定します。\n"
-            f"{pass_turn_rule}"
-            "4. `change_favorability`(任意): ユーザーとのやり取りで好感度が変化した場合に呼び出します。\n"
-            "5. `change_costume`(任意): 必要に応じてあなたの衣装を変更します。\n"
-            "6. `evaluate_and_store_memory`(必須): 上記の記憶ルールに基づき、今回の会話を評価します。**重要でない会話の場合は、必ず `is_important: False` を指定して呼び出してください。**\n"
-            "7. `acknowledge_referenced_memories`(必須): 応答の際に長期記憶を参考にした場合、その記憶のIDを報告します。**参考にしなかった場合は、空のリスト `[]` を渡して呼び出してください。**\n"
-            "\n"
-            f"{extra_rules}"
-            "\n"
-            "## 指示の形式\n"
-            "入力は `[状況説明] テキスト: [内容]` の形式で与えられます。これらの情報と記憶を総合的に判断し、あなたのキャラクターとして最も自然な応答を生成してください。"
+            extra_rules = _SOLO_RULES
+
+        self.system_instruction = _SYSTEM_INSTRUCTION_TEMPLATE.format(
+            name=self.name,
+            personality=self.personality,
+            partner_info=partner_info,
+            first_person=self.first_person,
+            user_reference=self.user_reference,
+            partner_reference_name=partner_reference_name,
+            pass_turn_rule=pass_turn_rule,
+            extra_rules=extra_rules,
         )
 
     def execute_change_costume(self, params):
@@ -880,15 +1062,11 @@ class CharacterController:
     def reload_api_settings(self, gemma_api_key, gemma_model_name, gemma_test_mode):
         """
         DesktopMascotからの指示で、GemmaAPIハンドラを新しい設定で再生成する。
+        ハンドラは次に使われるときに新しい設定で生成される。
         """
         print(f"[{self.name}] のGemmaAPI設定を更新します。")
-        self.gemma_api = GemmaAPI(
-            self.config,
-            gemma_api_key=gemma_api_key,
-            gemma_model_name=gemma_model_name,
-            gemma_test_mode=gemma_test_mode,
-            mascot=self
-        )
+        self._gemma_settings = (gemma_api_key, gemma_model_name, gemma_test_mode)
+        self._gemma_api = None
 
 
     def handle_gemini_response(self, final_text, detected_function_calls):
@@ -900,23 +1078,38 @@ class CharacterController:
         （将来の拡張用）AIから特定の関数実行が指示された場合に呼び出される想定のメソッド。
         現在の実装では `handle_response_from_character` で直接処理されているため、使用されていません。
         """
-        if function_name == "change_emotion":
-            emotion_en = args.get("emotion", "normal").lower()
-            emotion_jp = self.available_emotions.get(emotion_en, "normal")
-            print(f"[{self.name}] 関数実行: 感情を '{emotion_en}' -> '{emotion_jp}' に変更。")
-            if update_ui: self.ui.emotion_handler.update_image(emotion_jp)
-            return {"status": "success", "message": f"Emotion changed to {emotion_jp}", "emotion_jp": emotion_jp}
-        elif function_name == "pass_turn_to_partner":
-            continue_rally = args.get("continue_rally", False)
-            print(f"[{self.name}] 関数実行指示: pass_turn_to_partner(continue_rally={continue_rally})")
-            return {"status": "success", "message": f"Rally continuation set to {continue_rally}."}
-        elif function_name == "generate_speech":
-            speech_text = args.get("speech_text", "")
-            print(f"[{self.name}] 関数実行指示: generate_speech(speech_text='{speech_text[:50]}...')")
-            return {"status": "success", "message": "Speech generated.", "speech_text": speech_text}
-        else:
+        handler = self._FUNCTION_TABLE.get(function_name)
+        if handler is None:
             print(f"[{self.name}] 未定義の関数が呼び出されました: {function_name}")
             return {"status": "error", "message": f"Function {function_name} not found"}
+        return handler(self, args, update_ui)
+
+    def _do_change_emotion(self, args, update_ui):
+        """execute_function: 感情を変更する。"""
+        emotion_en = args.get("emotion", "normal").lower()
+        emotion_jp = self.available_emotions.get(emotion_en, "normal")
+        print(f"[{self.name}] 関数実行: 感情を '{emotion_en}' -> '{emotion_jp}' に変更。")
+        if update_ui: self.ui.emotion_handler.update_image(emotion_jp)
+        return {"status": "success", "message": f"Emotion changed to {emotion_jp}", "emotion_jp": emotion_jp}
+
+    def _do_pass_turn_to_partner(self, args, update_ui):
+        """execute_function: 相方へ発言権を渡すかどうかを受け取る。"""
+        continue_rally = args.get("continue_rally", False)
+        print(f"[{self.name}] 関数実行指示: pass_turn_to_partner(continue_rally={continue_rally})")
+        return {"status": "success", "message": f"Rally continuation set to {continue_rally}."}
+
+    def _do_generate_speech(self, args, update_ui):
+        """execute_function: 生成されたセリフを受け取る。"""
+        speech_text = args.get("speech_text", "")
+        print(f"[{self.name}] 関数実行指示: generate_speech(speech_text='{speech_text[:50]}...')")
+        return {"status": "success", "message": "Speech generated.", "speech_text": speech_text}
+
+    # execute_function の関数名 -> 処理メソッド
+    _FUNCTION_TABLE = {
+        "change_emotion": _do_change_emotion,
+        "pass_turn_to_partner": _do_pass_turn_to_partner,
+        "generate_speech": _do_generate_speech,
+    }
 
     def reload_theme(self):
         """
@@ -933,15 +1126,10 @@ class CharacterController:
         # VoiceManagerに設定の再読み込みを指示
         self.voice_manager.reload_settings()
 
-        # GemmaAPIの再読み込み
+        # GemmaAPIの再読み込み (次に使われるときに新しい設定で生成される)
         mascot_app = self.mascot_app
-        self.gemma_api = GemmaAPI(
-            self.config,
-            gemma_api_key=mascot_app.gemma_api_key,
-            gemma_model_name=mascot_app.gemma_model_name,
-            gemma_test_mode=mascot_app.gemma_test_mode,
-            mascot=self
-        )
+        self._gemma_settings = (mascot_app.gemma_api_key, mascot_app.gemma_model_name, mascot_app.gemma_test_mode)
+        self._gemma_api = None
 
     def start_event(self, event_data, is_recollection=False):
         """イベントランナーを生成し、シーケンスを開始する。"""
@@ -1145,17 +1333,20 @@ class CharacterController:
             print("1. character.ini を再読み込み")
             # 1. character.ini を再読み込み
             char_config_path = os.path.join(self.character_dir, 'character.ini')
-            self.char_config.read(char_config_path, encoding='utf-8')
+            self.char_data = fast_ini.load(char_config_path)
+            # 他のモジュールが保持しているConfigParserにも、同じオブジェクトのまま新しい内容を反映する
+            self.char_config.read_dict(self.char_data)
 
             print("2. 基本情報と色設定を更新")
             # 2. 基本情報と色設定を更新
-            self.name = self.char_config.get('INFO', 'CHARACTER_NAME')
-            self.personality = self.char_config.get('INFO', 'CHARACTER_PERSONALITY')
-            self.first_person = self.char_config.get('INFO', 'FIRST_PERSON', fallback='私')
-            self.user_reference = self.char_config.get('INFO', 'USER_REFERENCE', fallback='あなた')
-            self.transparent_color = self.char_config.get('INFO', 'TRANSPARENT_COLOR', fallback=self.mascot_app.default_transparent_color)
-            self.edge_color = self.char_config.get('INFO', 'EDGE_COLOR', fallback=self.mascot_app.default_edge_color)
-            transparency_mode = self.char_config.get('INFO', 'TRANSPARENCY_MODE', fallback=self.mascot_app.default_transparency_mode)
+            info = self.char_data['INFO']
+            self.name = info['character_name']
+            self.personality = info['character_personality']
+            self.first_person = info.get('first_person', '私')
+            self.user_reference = info.get('user_reference', 'あなた')
+            self.transparent_color = info.get('transparent_color', self.mascot_app.default_transparent_color)
+            self.edge_color = info.get('edge_color', self.mascot_app.default_edge_color)
+            transparency_mode = info.get('transparency_mode', self.mascot_app.default_transparency_mode)
             self.transparency_mode = transparency_mode.lower()
 
             if self.transparency_mode not in ('color_key', 'alpha'):
@@ -1197,7 +1388,8 @@ class CharacterController:
                 costume_id=self.current_costume_id,
                 triggered_by_user=False,
                 is_initial_setup=False,
-                generate_comment=False
+                generate_comment=False,
+                force_reload=True
             )
 
             print("8. UI表示を最終的に更新（名札、ハート表示など）")
@@ -1228,3 +1228,5 @@ class CharacterUIGroup(MascotDNDWindow):
         self.tk_heart_images.clear()
         self.alpha_heart_images.clear()
         self.tk_still_images.clear()
+        # 衣装画像も、ファイルが差し替えられている可能性があるので読み直させる
+        self.emotion_handler.clear_asset_cache()
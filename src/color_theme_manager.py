@@ -1,8 +1,12 @@
 # src/color_theme_manager.py
 
 import os
+from collections import namedtuple
 from configparser import ConfigParser
 
+# 設定ウィンドウなどで頻繁に参照する色をまとめたスナップショット
+ThemeColors = namedtuple('ThemeColors', 'bg_main bg_text link_text border_focus info_text input_bg input_text')
+
 class ColorThemeManager:
     """
     UIのカラーテーマを管理するクラス。
@@ -70,6 +74,9 @@ class ColorThemeManager:
         """
         self.app_config = app_config
         self.colors = self.DEFAULT_COLORS.copy()
+        self._snapshot = None
+        # テーマを読み込むたびに増える番号 (スタイルの再設定が必要か判定するために使う)
+        self.version = 0
         self.load_theme()
 
     def load_theme(self):
@@ -77,6 +84,8 @@ class ColorThemeManager:
         config.iniからテーマ名を取得し、対応するテーマファイルを読み込む。
         """
         self.colors = self.DEFAULT_COLORS.copy() # まずデフォルト色にリセット
+        self._snapshot = None # テーマが変わるのでスナップショットも作り直す
+        self.version += 1
         
         try:
             theme_name = self.app_config.get('UI', 'theme', fallback='').strip()
@@ -109,6 +118,15 @@ class ColorThemeManager:
         """
         return self.colors.get(key, '#000000')
 
+    def snapshot(self) -> ThemeColors:
+        """
+        よく使う色をまとめたThemeColorsを返す。
+        テーマを読み込み直すまでは同じオブジェクトを使い回す。
+        """
+        if self._snapshot is None:
+            self._snapshot = ThemeColors._make(self.get(name) for name in ThemeColors._fields)
+        return self._snapshot
+
     def get_available_themes(self) -> list:
         """
         'colorthemes'フォルダ内にある利用可能なテーマ名のリストを返す。
@@ -18,6 +18,7 @@ import json
 import webbrowser
 
 # --- 自作モジュールのインポート ---
+from src import fast_ini
 from src.log_manager import ConversationLogManager
 from src.input_history_manager import InputHistoryManager
 from src.character_controller import CharacterController
@@ -80,7 +81,7 @@ class RecommendationNotificationDialog(tk.Toplevel):
         btn_open = ttk.Button(button_frame, text="設定を開く", command=self._open_settings, style="Dialog.TButton")
         btn_open.pack(side="right", padx=app.padding_normal)
         
-        self.update_idletasks()
+        # 位置のみの指定なので、レイアウトの強制確定(update_idletasks)は不要。サイズはTkが自動で決める
         self.geometry(f"+{parent.winfo_x()+50}+{parent.winfo_y()+50}") # 親ウィンドウの近くに表示
         
         self.protocol("WM_DELETE_WINDOW", self.destroy)
@@ -133,6 +134,15 @@ class DesktopMascot:
 
         self.root = tk.Tk()
         self.root.withdraw() 
+
+        # 設定の読み込みやウィンドウの準備と並行して、全キャラクターのcharacter.iniを先読みしておく
+        # (キャラクター選択ダイアログやCharacterControllerの生成時に、解析済みの結果を使える)
+        characters_dir = 'characters'
+        if os.path.isdir(characters_dir):
+            fast_ini.prefetch([
+                os.path.join(characters_dir, d, 'character.ini') for d in os.listdir(characters_dir)
+                if os.path.isdir(os.path.join(characters_dir, d))
+            ])
         
         self.config = ConfigParser()
         self.config.read('config.ini', encoding='-utf-8-sig')
@@ -263,7 +273,7 @@ class DesktopMascot:
         self.is_event_running = False # イベント実行中フラグ
         self.last_time_signal_hour = -1
         self.auto_speech_cool_time = self.generate_cool_time()
-        self.last_interaction_time = time.time()
+        self.last_interaction_time = time.monotonic()
         self.is_user_away = False
         self.is_in_rally = False
         self.current_rally_count = 0
@@ -404,11 +414,10 @@ class DesktopMascot:
         """
         char_ini_path = os.path.join('characters', char_dir_name, 'character.ini')
         try:
-            if os.path.exists(char_ini_path):
-                config = ConfigParser()
-                config.read(char_ini_path, encoding='utf-8')
-                if config.has_section('INFO') and config.has_option('INFO', 'CHARACTER_NAME'):
-                    return config.get('INFO', 'CHARACTER_NAME')
+            # 解析結果はファイルが更新されるまで使い回される
+            name = fast_ini.load(char_ini_path).get('INFO', {}).get('character_name')
+            if name is not None:
+                return name
         except Exception:
             pass # エラー時はフォールバック
         return char_dir_name # 取得失敗時はディレクトリ名を返す
@@ -1088,6 +1097,10 @@ class DesktopMascot:
 
             print("最終シャットダウン処理を実行します。")
             self._save_position_config()
+            # 保存待ちのセーブデータ (好感度・音量) を書き出す
+            for char in self.characters:
+                if char:
+                    char.flush_savedata()
             if self.tray_icon:
                 self.tray_icon.stop()
             if self.global_voice_engine_manager:
@@ -2162,12 +2175,12 @@ class DesktopMascot:
         """会話ラリーの後はクールタイムを延長します。"""
         base_cool_time = self.generate_cool_time()
         self.auto_speech_cool_time = base_cool_time + (self.current_rally_count * 90)
-        self.last_interaction_time = time.time()
+        self.last_interaction_time = time.monotonic()
 
     def reset_cool_time(self):
         """クールタイムをランダムに再設定します。"""
         self.auto_speech_cool_time = self.generate_cool_time()
-        self.last_interaction_time = time.time()
+        self.last_interaction_time = time.monotonic()
 
     def generate_cool_time(self): 
         return random.randint(self.cool_time_min, self.cool_time_max)
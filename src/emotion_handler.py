@@ -55,6 +55,9 @@ class EmotionHandler:
         self.image_label = tk.Label(root, bg=self.transparent_color_hex, borderwidth=0, highlightthickness=0)
         
         self.image_assets = {} # 読み込んだ画像アセットをキャッシュ
+        # 左右反転の切り替えで読み込み直さないよう、現在の衣装の両方の向きの画像アセットを保持する
+        # {(画像パス, 反転, 幅, 透過設定..., 感情): image_assets}
+        self._asset_cache = {}
         self.placeholder_cache = {}
         self.current_emotion = "normal"
         self.is_showing_still = False # スチル表示中フラグ
@@ -77,6 +80,9 @@ class EmotionHandler:
         self.active_areas = []
         self.selected_index = 0
         self.active_cursor_name = None
+        # カーソル移動に合わせたラベル移動をまとめて行うための予約IDと最新の座標
+        self._label_move_job = None
+        self._pending_label_pos = (0, 0)
 
         # テーママネージャーを取得
         theme = self.character_controller.mascot_app.theme_manager
@@ -228,7 +234,6 @@ class EmotionHandler:
         """
         print(f"アセットを読み込みます。画像パス: {image_path}, 利用可能感情: {list(available_emotions.keys())}")
         self.base_image_path = image_path
-        self.image_assets.clear()
 
         # 衣装変更時は、まず基本となる 'normal' のタッチエリアを読み込む
         self.load_touch_areas_for_emotion('normal')
@@ -246,6 +251,15 @@ class EmotionHandler:
         except Exception as e:
             print(f"警告: 基準画像の読み込み中にエラー: {e}")
 
+        # 同じ条件で読み込んだ画像があれば、デコードや透過処理をやり直さずにそれを使う
+        cache_key = self._asset_cache_key(image_path, available_emotions)
+        cached_assets = self._asset_cache.get(cache_key)
+        if cached_assets is not None:
+            print("  - 読み込み済みの画像アセットを再利用します。")
+            self.image_assets = cached_assets
+            return
+        self.image_assets = {}
+
         # normalの画像を最初に読み込み、全感情のフォールバック先として確保する
         normal_jp = available_emotions.get('normal', 'normal')
         
@@ -314,18 +328,37 @@ class EmotionHandler:
             }
             print(f"  - 感情 '{emotion_jp}' 読み込み完了 (待機画像分離: {standby_img is not None}, 口パク対応: {final_close_img != final_open_img})")
 
+        # 向き以外の条件が異なる古いアセットは破棄し、両方の向きの分だけを残す
+        self._asset_cache = {
+            key: assets for key, assets in self._asset_cache.items()
+            if key[0] == cache_key[0] and key[2:] == cache_key[2:]
+        }
+        self._asset_cache[cache_key] = self.image_assets
+
+    def _asset_cache_key(self, image_path, available_emotions):
+        """画像アセットの読み込み結果を左右する条件をまとめたキーを返す。2番目の要素が向き。"""
+        return (
+            image_path, self.is_flipped, self.window_width, self.transparency_mode,
+            self.transparent_color_rgb, self.edge_color_rgb, self.tolerance,
+            tuple(available_emotions.items())
+        )
+
+    def clear_asset_cache(self):
+        """保持している画像アセットを破棄し、次回の読み込みでファイルから読み直させる。"""
+        self._asset_cache.clear()
+
     def load_touch_areas_for_emotion(self, emotion_en: str):
         """
         指定された感情(英語ID)に対応するタッチエリアを読み込む。
         """
         costume_section = self.character_controller.costumes[self.character_controller.current_costume_id]['config_section']
         
-        # CharacterDataから直接ini設定を読み込むのではなく、
-        # CharacterControllerを経由して、マスコット本体が保持しているiniパーサーから読み込む
-        char_config = self.character_controller.char_config
+        # CharacterControllerを経由して、マスコット本体が保持しているcharacter.iniの解析結果から読み込む
+        # (感情が変わるたびに呼ばれるため、ConfigParserを介さず辞書を直接参照する)
+        section = self.character_controller.char_data.get(costume_section)
         
         self.touch_areas = []
-        if not char_config.has_section(costume_section):
+        if section is None:
             print(f"情報: character.iniにタッチエリアセクション [{costume_section}] が見つかりませんでした。")
             return
 
@@ -338,7 +371,7 @@ class EmotionHandler:
 
         def _parse_areas_from_pattern(pattern):
             areas = []
-            for key, value in char_config.items(costume_section):
+            for key, value in section.items():
                 match = pattern.match(key)
                 if match:
                     try:
@@ -548,6 +581,7 @@ class EmotionHandler:
 
     def destroy(self):
         """このハンドラに関連するUIリソース（アクションラベルウィンドウなど）を破棄します。"""
+        self._cancel_label_move()
         if self.action_label_window and self.action_label_window.winfo_exists():
             self.action_label_window.destroy()
 
@@ -560,12 +594,32 @@ class EmotionHandler:
             self.selected_index = 0
             self._update_action_display(event)
         elif self.active_areas:
-            app = self.character_controller.mascot_app
-            x_offset = app.padding_large
-            y_offset = app.padding_normal
-            x_pos = self.image_label.winfo_rootx() + event.x + x_offset
-            y_pos = self.image_label.winfo_rooty() + event.y + y_offset
-            self.action_label_window.geometry(f"+{int(x_pos)}+{int(y_pos)}")
+            # マウス移動のたびにウィンドウを動かさず、アイドル時に最新の位置へ1回だけ動かす
+            self._pending_label_pos = (event.x, event.y)
+            if self._label_move_job is None:
+                self._label_move_job = self.image_label.after_idle(self._move_action_label)
+
+    def _cancel_label_move(self):
+        """予約されているアクション名ラベルの移動を取り消します。"""
+        if self._label_move_job is not None:
+            try:
+                self.image_label.after_cancel(self._label_move_job)
+            except tk.TclError:
+                pass
+            self._label_move_job = None
+
+    def _move_action_label(self):
+        """予約されていたアクション名ラベルの移動を、最新のカーソル位置で実行します。"""
+        self._label_move_job = None
+        if not self.active_areas or not self.action_label_window.winfo_exists():
+            return
+        x, y = self._pending_label_pos
+        app = self.character_controller.mascot_app
+        x_offset = app.padding_large
+        y_offset = app.padding_normal
+        x_pos = self.image_label.winfo_rootx() + x + x_offset
+        y_pos = self.image_label.winfo_rooty() + y + y_offset
+        self.action_label_window.geometry(f"+{int(x_pos)}+{int(y_pos)}")
 
     def on_mouse_wheel(self, event):
         """マウスホイールが回転したときの処理。重なったタッチエリアの選択を切り替えます。"""
@@ -580,6 +634,8 @@ class EmotionHandler:
         
     def _update_action_display(self, event):
         """カーソルとアクション名ラベルの表示を、現在の状態に合わせて更新します。"""
+        # ここでラベルの位置を直接決めるため、古い座標での移動の予約は取り消す
+        self._cancel_label_move()
         if not self.active_areas:
             if self.active_cursor_name:
                 self.image_label.config(cursor="")
@@ -599,7 +655,10 @@ class EmotionHandler:
 
         app = self.character_controller.mascot_app
         
-        cursor_x_root = self.image_label.winfo_rootx() + event.x
+        # ラベルの画面上の位置はTclへの問い合わせになるため、一度だけ取得して使い回す
+        label_root_x = self.image_label.winfo_rootx()
+        label_root_y = self.image_label.winfo_rooty()
+        cursor_x_root = label_root_x + event.x
         screen_width = self.image_label.winfo_screenwidth()
         margin_screen = app.padding_large
         available_width_screen = screen_width - cursor_x_root - margin_screen
@@ -616,10 +675,9 @@ class EmotionHandler:
         
         x_offset = app.padding_large
         y_offset = app.padding_normal
-        x_pos = self.image_label.winfo_rootx() + event.x + x_offset
-        y_pos = self.image_label.winfo_rooty() + event.y + y_offset
+        x_pos = label_root_x + event.x + x_offset
+        y_pos = label_root_y + event.y + y_offset
         self.action_label_window.geometry(f"+{int(x_pos)}+{int(y_pos)}")
-        print("emotion_handler.py > _update_action_display > self.action_label_window.deiconify()")
         self.action_label_window.deiconify()
 
         if cursor_name != self.active_cursor_name:
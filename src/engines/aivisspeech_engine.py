@@ -98,21 +98,24 @@ class AivisSpeechEngine(BaseVoiceEngine):
             res_query.raise_for_status()
             audio_query_data = res_query.json()
 
-            # --- 音量計算ロジック (引数の voice_params を使用) ---
-            emotion_base_volume = 1.0
+            # --- 適用する感情パラメータを一度だけ引く (引数の voice_params を使用) ---
+            # 該当する感情がなければ normal のパラメータを使う
+            params_to_apply = {}
             if voice_params:
-                params_to_apply = voice_params.get(emotion_jp, voice_params.get("normal", {}))
-                emotion_base_volume = float(params_to_apply.get('volumeScale', 1.0))
+                params_to_apply = voice_params.get(emotion_jp)
+                if params_to_apply is None:
+                    params_to_apply = voice_params.get("normal", {})
+
+            # --- 音量計算ロジック ---
+            emotion_base_volume = float(params_to_apply.get('volumeScale', 1.0))
 
             character_volume_ratio = character_volume_percent / 100.0
             final_volume_scale = emotion_base_volume * character_volume_ratio
 
-            # --- 感情パラメータ適用ロジック (引数の voice_params を使用) ---
-            if voice_params:
-                params_to_apply = voice_params.get(emotion_jp, voice_params.get("normal", {}))
-                for key, value in params_to_apply.items():
-                    if key in audio_query_data and key != 'volumeScale':
-                        audio_query_data[key] = float(value)
+            # --- 感情パラメータ適用ロジック ---
+            for key, value in params_to_apply.items():
+                if key in audio_query_data and key != 'volumeScale':
+                    audio_query_data[key] = float(value)
             
             audio_query_data['volumeScale'] = final_volume_scale
 
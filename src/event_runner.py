@@ -1,5 +1,30 @@
 # src/event_runner.py
 
+# 回想モードでスキップするコマンド
+# ★画面効果は回想でも演出として実行するため、スキップ対象に含めない
+_RECOLLECTION_SKIP_COMMANDS = frozenset((
+    "set_favorability",
+    "add_long_term_memory",
+    "set_flag",
+    "change_persona",
+))
+
+# コマンドの種類 -> (CharacterControllerのメソッド名, 実行後に自動で次のステップへ進むか)
+# dialogue / monologue / choice はユーザーの操作で、screen_effect は完了待機(wait)の設定に応じて、
+# branch_on_flag は分岐先へのジャンプで、それぞれ内部から次のステップへ進む
+_COMMAND_TABLE = {
+    "dialogue": ("execute_dialogue", False),
+    "monologue": ("execute_monologue", False),
+    "choice": ("execute_choice", False),
+    "screen_effect": ("execute_screen_effect", False),
+    "set_favorability": ("execute_set_favorability", True),
+    "add_long_term_memory": ("execute_add_long_term_memory", True),
+    "change_costume": ("execute_change_costume", True),
+    "set_flag": ("execute_set_flag", True),
+    "change_persona": ("execute_change_persona", True),
+    "branch_on_flag": ("execute_branch_on_flag", False),
+}
+
 class EventRunner:
     """
     単一のイベントシーケンスの進行を管理するクラス。
@@ -78,61 +103,19 @@ class EventRunner:
         command_type = command.get("type")
         params = command.get("params", {})
 
-        # --- 回想モードでスキップするコマンドを定義 ---
-        recollection_skip_commands = [
-            "set_favorability",
-            "add_long_term_memory",
-            "set_flag",
-            "change_persona",
-            # ★画面効果は回想でも演出として実行するため、スキップ対象に含めない
-        ]
-        
-        if self.is_recollection and command_type in recollection_skip_commands:
+        if self.is_recollection and command_type in _RECOLLECTION_SKIP_COMMANDS:
             print(f"[回想モード] コマンド '{command_type}' をスキップしました。")
             self.proceed() # 何もせず次のステップへ
             return
-        
+
         # コマンドの種類に応じてCharacterControllerのメソッドを呼び出す
-        if command_type == "dialogue":
-            self.char_ctrl.execute_dialogue(params)
-        elif command_type == "monologue":
-            self.char_ctrl.execute_monologue(params)
-        elif command_type == "choice":
-            self.char_ctrl.execute_choice(params)
-        # ★ここから追加
-        elif command_type == "screen_effect":
-            # このコマンドは完了待機(wait)の設定に応じて内部でproceed()を呼ぶため、
-            # ここでは呼び出しのみ行い、即座にreturnする。
-            self.char_ctrl.execute_screen_effect(params)
-            return
-        # ★ここまで追加
-        elif command_type == "set_favorability":
-            self.char_ctrl.execute_set_favorability(params)
-            # このコマンドは自動で次に進む
-            self.proceed()
-        elif command_type == "set_favorability":
-            self.char_ctrl.execute_set_favorability(params)
-            # このコマンドは自動で次に進む
-            self.proceed()
-        elif command_type == "add_long_term_memory":
-            self.char_ctrl.execute_add_long_term_memory(params)
-            # このコマンドは自動で次に進む
-            self.proceed()
-        elif command_type == "change_costume":
-            self.char_ctrl.execute_change_costume(params)
-            # このコマンドは自動で次に進む
-            self.proceed()
-        elif command_type == "set_flag":
-            self.char_ctrl.execute_set_flag(params)
-            self.proceed()
-        elif command_type == "change_persona":
-            self.char_ctrl.execute_change_persona(params)
-            # このコマンドも自動で次に進む
-            self.proceed()
-        elif command_type == "branch_on_flag":
-            # 分岐は回想モードでも通常通り評価・実行される
-            self.char_ctrl.execute_branch_on_flag(params)
-            # このコマンドは内部でジャンプするか次に進むかを決定する
-        else:
+        entry = _COMMAND_TABLE.get(command_type)
+        if entry is None:
             print(f"警告: 不明なコマンドタイプ '{command_type}' です。スキップします。")
             self.proceed()
+            return
+
+        method_name, auto_proceed = entry
+        getattr(self.char_ctrl, method_name)(params)
+        if auto_proceed:
+            self.proceed()
@@ -0,0 +1,102 @@
+# src/fast_ini.py
+
+import os
+import re
+import threading
+
+# セクション見出し ([SECTION]) と key = value (または key: value) 行の正規表現
+SECTION_RE = re.compile(r'^\[(.+)\]')
+KV_RE = re.compile(r'^([^=:\s][^=:]*?)\s*[=:]\s*(.*)$')
+
+# 解析済みのファイルを {パス: (更新時刻, サイズ, 解析結果)} で保持するキャッシュ
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+def parse(text, raw=False):
+    """
+    INI形式の文字列を {セクション名: {小文字のキー名: 値}} の辞書に変換します。
+    character.iniのような読み取り専用の設定ファイル向けに、ConfigParserの代わりに使う軽量なパーサーです。
+
+    ConfigParserと同じく、キー名は小文字に変換され、';' または '#' で始まる行はコメントとして無視されます。
+    インデントされた行は直前の値の続きとして扱い、その間の空行も値に含めます (値の末尾の空行は含めません)。
+    値の補間 (%(name)s) は行いませんが、ConfigParser.get() と同じ値になるよう、エスケープされた '%%' は '%' に戻します。
+    raw=True の場合は '%%' もファイルに書かれたまま返します (ConfigParser.read_dict() に渡す場合など)。
+    """
+    sections = {}
+    current = None
+    last_key = None
+    blank_lines = 0 # 直前のキーの値の後に続いている空行の数
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if last_key is not None:
+                blank_lines += 1
+            continue
+        if stripped[0] in ';#':
+            continue
+
+        # インデントされた行は、直前のキーの値の続き (間の空行も値に含める)
+        if line[0] in ' \t' and last_key is not None:
+            current[last_key] += '\n' * (blank_lines + 1) + (stripped if raw else stripped.replace('%%', '%'))
+            blank_lines = 0
+            continue
+        blank_lines = 0
+
+        m = SECTION_RE.match(stripped)
+        if m:
+            current = sections.setdefault(m.group(1), {})
+            last_key = None
+            continue
+
+        if current is None:
+            # セクションより前にあるキーは無視する
+            continue
+        m = KV_RE.match(stripped)
+        if m:
+            last_key = m.group(1).lower()
+            value = m.group(2)
+            current[last_key] = value if raw else value.replace('%%', '%')
+        else:
+            last_key = None
+    return sections
+
+def load(path, encoding='utf-8-sig'):
+    """
+    INIファイルを読み込んで解析した辞書を返します。
+    ファイルの更新時刻とサイズが前回と同じなら、再解析せずにキャッシュした辞書を返します。
+    返す辞書は呼び出し元の間で共有されるため、変更せずに読み取り専用として扱ってください。
+    ファイルが存在しない場合は、ConfigParser.read() と同様に空の辞書を返します。
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    try:
+        with open(path, 'r', encoding=encoding) as f:
+            text = f.read()
+    except FileNotFoundError:
+        return {}
+    data = parse(text)
+    with _CACHE_LOCK:
+        _CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+def prefetch(paths, encoding='utf-8-sig'):
+    """
+    指定されたINIファイルを別スレッドで読み込み、解析結果をキャッシュしておきます。
+    起動時に呼んでおくと、後で load() したときにディスクの読み込みと解析を待たずに済みます。
+    """
+    def worker():
+        for path in paths:
+            try:
+                load(path, encoding)
+            except Exception as e:
+                # 先読みの失敗は無視し、実際に load() したときに改めてエラーを扱う
+                print(f"情報: {path} の先読みに失敗しました: {e}")
+
+    threading.Thread(target=worker, daemon=True).start()
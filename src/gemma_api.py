@@ -4,6 +4,15 @@ from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from google import genai
 import re
 import random
+from functools import lru_cache
+
+@lru_cache(maxsize=4)
+def _shared_client(api_key):
+    """
+    APIキーごとにgenai.Clientを1つだけ生成して使い回します。
+    キャラクターごとのGemmaAPIが同じHTTP接続プールを共有できるようにするためのものです。
+    """
+    return genai.Client(api_key=api_key)
 
 class GemmaAPI:
     """
@@ -34,9 +43,10 @@ class GemmaAPI:
         self.model_name = gemma_model_name
         self.safety_settings = self._parse_safety_settings(config)
         
-        # テストモードでない場合のみ、APIクライアントを初期化します。
+        # テストモードでない場合のみ、APIクライアントを用意します。
+        # クライアントは同じAPIキーを使う他のキャラクターと共有します。
         if not self.gemma_test_mode:
-            self.client = genai.Client(api_key=gemma_api_key.strip())
+            self.client = _shared_client(gemma_api_key.strip())
 
     def _parse_safety_settings(self, config):
         """
@@ -5,6 +5,7 @@ import time
 import threading
 from configparser import ConfigParser, NoSectionError, NoOptionError
 
+from src import fast_ini
 from src.engines.voicevox_engine import VoicevoxEngine
 from src.engines.aivisspeech_engine import AivisSpeechEngine
 
@@ -48,9 +49,9 @@ class GlobalVoiceEngineManager:
             char_ini_path = os.path.join(char_dir_path, 'character.ini')
             if os.path.exists(char_ini_path):
                 try:
-                    char_config = ConfigParser()
-                    char_config.read(char_ini_path, encoding='utf-8')
-                    engine_name = char_config.get('VOICE', 'engine', fallback='voicevox').lower()
+                    # CharacterControllerと同じ解析結果のキャッシュを使う
+                    char_data = fast_ini.load(char_ini_path)
+                    engine_name = char_data.get('VOICE', {}).get('engine', 'voicevox').lower()
                     required_engines.add(engine_name)
                 except Exception as e:
                     print(f"警告: {char_ini_path} の読み込み中にエラー: {e}")
@@ -2,9 +2,10 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from configparser import ConfigParser
 import os
 
+from src import fast_ini
+
 class StartupCharacterSelector(tk.Toplevel):
     """
     アプリケーション起動時に表示されるキャラクター選択ダイアログ。
@@ -97,13 +98,10 @@ class StartupCharacterSelector(tk.Toplevel):
     def _get_character_display_name(self, char_dir):
         """ディレクトリ名から表示名を取得する"""
         char_ini_path = os.path.join(self.project_manager.characters_dir, char_dir, 'character.ini')
-        if os.path.exists(char_ini_path):
-            try:
-                config = ConfigParser()
-                config.read(char_ini_path, encoding='utf-8')
-                return config.get('INFO', 'CHARACTER_NAME', fallback=char_dir)
-            except Exception:
-                pass
+        try:
+            return fast_ini.load(char_ini_path).get('INFO', {}).get('character_name', char_dir)
+        except Exception:
+            pass
         return char_dir
 
     def _populate_character_list(self):
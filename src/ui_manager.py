@@ -6,7 +6,7 @@ import threading
 import os
 import webbrowser
 
-from configparser import ConfigParser, NoSectionError, NoOptionError 
+from src import fast_ini
 try:
     from pystray import Icon as TrayIcon, Menu as TrayMenu, MenuItem as TrayMenuItem
     from PIL import Image
@@ -322,6 +322,21 @@ class UIManager:
             if available_keys:
                 self.app.selected_capture_target_key.set(available_keys[0])
 
+    def _get_menu_display_name(self, char_dir):
+        """
+        メニューに表示するキャラクター名を返します。
+        SYSTEM_NAME を優先し、なければ CHARACTER_NAME、どちらも空ならディレクトリ名を使います。
+        character.iniの解析結果はファイルが更新されるまで使い回すため、メニューを開くたびに解析し直しません。
+        """
+        char_ini_path = os.path.join('characters', char_dir, 'character.ini')
+        try:
+            info = fast_ini.load(char_ini_path).get('INFO', {})
+        except Exception as e:
+            # iniファイルの解析中に何か問題があれば警告を出し、ディレクトリ名で続行
+            print(f"警告: {char_ini_path} の読み込み中にエラーが発生しました。: {e}")
+            return char_dir
+        return info.get('system_name', '').strip() or info.get('character_name', '').strip() or char_dir
+
     def update_character_add_menu(self):
         """キャラクター追加メニューを動的に生成・更新します。"""
         self.character_add_menu.delete(0, "end")
@@ -333,23 +348,7 @@ class UIManager:
             return
 
         for char_dir in available_chars:
-            display_name = char_dir
-            char_ini_path = os.path.join('characters', char_dir, 'character.ini')
-            
-            try:
-                if os.path.exists(char_ini_path):
-                    config = ConfigParser()
-                    config.read(char_ini_path, encoding='utf-8')
-                    if config.has_section('INFO'):
-                        system_name = config.get('INFO', 'SYSTEM_NAME', fallback='').strip()
-                        if system_name:
-                            display_name = system_name
-                        else:
-                            character_name = config.get('INFO', 'CHARACTER_NAME', fallback='').strip()
-                            if character_name:
-                                display_name = character_name
-            except Exception as e:
-                print(f"警告: {char_ini_path} の読み込み中にエラーが発生しました。: {e}")
+            display_name = self._get_menu_display_name(char_dir)
 
             self.character_add_menu.add_command(
                 label=display_name,
@@ -367,31 +366,7 @@ class UIManager:
             return
 
         for char_dir in available_chars:
-            display_name = char_dir  # 最悪の場合のフォールバック名
-            char_ini_path = os.path.join('characters', char_dir, 'character.ini')
-            
-            try:
-                if os.path.exists(char_ini_path):
-                    config = ConfigParser()
-                    config.read(char_ini_path, encoding='utf-8')
-                    
-                    # [INFO] セクションの存在を確認
-                    if config.has_section('INFO'):
-                        # 1. SYSTEM_NAME を取得試行（値が空でないかstrip()でチェック）
-                        system_name = config.get('INFO', 'SYSTEM_NAME', fallback='').strip()
-                        
-                        if system_name:
-                            display_name = system_name
-                        else:
-                            # 2. SYSTEM_NAME がない、または空の場合、CHARACTER_NAME を取得
-                            character_name = config.get('INFO', 'CHARACTER_NAME', fallback='').strip()
-                            if character_name:
-                                display_name = character_name
-                            # 両方ない、または空の場合は、初期値のディレクトリ名が使われる
-            
-            except Exception as e:
-                # iniファイルの解析中に何か問題があれば警告を出し、ディレクトリ名で続行
-                print(f"警告: {char_ini_path} の読み込み中にエラーが発生しました。: {e}")
+            display_name = self._get_menu_display_name(char_dir)
 
             self.character_change_menu.add_command(
                 label=display_name,
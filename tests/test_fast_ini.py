@@ -0,0 +1,38 @@
+# tests/test_fast_ini.py
+
+from configparser import ConfigParser
+
+import pytest
+
+from src import fast_ini
+
+CASES = [
+    # 複数行の値 (間の空行は値に含め、末尾の空行は含めない)
+    "[A]\nkey = line1\n\n  line3\n",
+    "[A]\nkey = line1\n\n\n  line4\n\n\n[B]\nx = 1\n",
+    "[A]\nkey =\n  line2\n",
+    "[A]\nkey = line1\n\nnext = 2\n  more\n",
+    # コメント行 (値の途中にあっても値を終わらせない)
+    "; head\n[A]\n# comment\nkey = line1\n; comment\n  line2\n  # comment\n  line3\n",
+    # ':' 区切りと、大文字のキー名
+    "[A]\nKey: value\nOther : a = b\nurl = http://localhost:50021\n",
+    # '%%' のエスケープ
+    "[A]\nrate = 100%%\nnote = 50%% off\n  and 10%% more\n",
+]
+
+def _configparser_dict(text, **kwargs):
+    config = ConfigParser(**kwargs)
+    config.read_string(text)
+    return {section: {key: config.get(section, key) for key in config[section]} for section in config.sections()}
+
+@pytest.mark.parametrize("text", CASES)
+def test_parse_matches_configparser_get(text):
+    # '%%' を '%' に戻した値は、補間ありのConfigParser.get()と一致する
+    assert fast_ini.parse(text) == _configparser_dict(text)
+
+@pytest.mark.parametrize("text", CASES)
+def test_parse_raw_matches_configparser_without_interpolation(text):
+    assert fast_ini.parse(text, raw=True) == _configparser_dict(text, interpolation=None)
+
+def test_parse_keeps_single_percent():
+    assert fast_ini.parse("[A]\nrate = 100%\n") == {'A': {'rate': '100%'}}